@@ -0,0 +1,82 @@
+import time
+import numpy as np
+from constants import CARD_ANIMATION_MS
+
+# Time-based tweens for the card sprites. All tweens of a view live in one set of arrays and
+# are advanced together once per frame, so the cost per frame hardly grows with the number
+# of cards or seats, and the speed no longer depends on the frame rate.
+INITIAL_CAPACITY = 32
+
+
+def clock_ms():
+    """Default animation clock: monotonic milliseconds."""
+    return time.monotonic() * 1000.0
+
+def ease_out_cubic(t):
+    """Starts fast and slows down into the target; t and the result run from 0 to 1."""
+    return 1.0 - (1.0 - t) ** 3
+
+
+class TweenSystem:
+    """Moves points from a start to an end position over a duration, with easing.
+
+    positions[i] is the current position of tween i (a row that can be read directly);
+    busy tells in O(1) whether any tween is still running.
+    """
+    def __init__(self, capacity=INITIAL_CAPACITY, easing=ease_out_cubic):
+        self.easing = easing
+        self.positions = np.zeros((capacity, 2))
+        self._start = np.zeros((capacity, 2))
+        self._end = np.zeros((capacity, 2))
+        self._start_ms = np.zeros(capacity)
+        self._duration_ms = np.ones(capacity)
+        self.moving = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        self.active = 0 # Number of tweens still moving
+
+    @property
+    def busy(self):
+        return self.active > 0
+
+    def _grow(self):
+        capacity = 2 * len(self.positions)
+        for name in ("positions", "_start", "_end", "_start_ms", "_duration_ms", "moving"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, start_pos, end_pos, now_ms, duration_ms=CARD_ANIMATION_MS):
+        """Starts a tween and returns its index."""
+        if self.count == len(self.positions):
+            self._grow()
+        i = self.count
+        self.count += 1
+        self.positions[i] = self._start[i] = start_pos
+        self._end[i] = end_pos
+        self._start_ms[i] = now_ms
+        self._duration_ms[i] = max(duration_ms, 1)
+        self.moving[i] = True
+        self.active += 1
+        return i
+
+    def update(self, now_ms):
+        """Advances every running tween to now_ms."""
+        if not self.active: return
+        n = self.count
+        running = np.flatnonzero(self.moving[:n])
+        t = np.clip((now_ms - self._start_ms[running]) / self._duration_ms[running], 0.0, 1.0)
+        eased = self.easing(t)[:, None]
+        start = self._start[running]
+        self.positions[running] = start + (self._end[running] - start) * eased
+        done = running[t >= 1.0]
+        if done.size:
+            self.positions[done] = self._end[done] # Exactly on target
+            self.moving[done] = False
+            self.active -= done.size
+
+    def clear(self):
+        """Removes all tweens."""
+        self.moving[:self.count] = False
+        self.count = 0
+        self.active = 0
@@ -0,0 +1,111 @@
+import json
+import os
+import pygame
+from constants import (
+    CARDS_FOLDER, DECK_IMAGE_FILENAME, ATLAS_IMAGE_PATH, ATLAS_INDEX_PATH,
+    CARD_WIDTH, CARD_HEIGHT, WHITE, SUITS, VALUES
+)
+from log import get_logger
+
+logger = get_logger(__name__)
+
+# All card faces plus the back, pre-scaled to CARD_WIDTH x CARD_HEIGHT and packed in one image:
+# one row per suit, one column per value, the back alone on the last row.
+ATLAS_VERSION = 1 # Bump when the layout changes so old atlases are rebuilt
+DECK_KEY = "back"
+
+
+def _sprite_sources():
+    """(sprite key, source file name) for every sprite in the atlas."""
+    sources = [(f"{value}_of_{suit}", f"{value}_of_{suit}.png") for suit in SUITS for value in VALUES]
+    sources.append((DECK_KEY, DECK_IMAGE_FILENAME))
+    return sources
+
+def atlas_signature():
+    """Describes what the atlas was built from: source file stats and the card size."""
+    sources = {}
+    for _, filename in _sprite_sources():
+        try:
+            stat = os.stat(os.path.join(CARDS_FOLDER, filename))
+            sources[filename] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            sources[filename] = None # Missing: a placeholder is packed instead
+    return {"version": ATLAS_VERSION, "card_size": [CARD_WIDTH, CARD_HEIGHT], "sources": sources}
+
+def _deck_placeholder():
+    deck_image = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
+    deck_image.fill((0, 50, 0)) # Dark green
+    pygame.draw.rect(deck_image, WHITE, deck_image.get_rect(), 3)
+    return deck_image
+
+def build_atlas(signature):
+    """Loads and scales every source image once and packs them into an atlas. Returns (atlas, index)."""
+    from utils import create_placeholder_card
+
+    columns = len(VALUES)
+    atlas = pygame.Surface((columns * CARD_WIDTH, (len(SUITS) + 1) * CARD_HEIGHT), pygame.SRCALPHA)
+    positions = {}
+    for i, (key, filename) in enumerate(_sprite_sources()):
+        path = os.path.join(CARDS_FOLDER, filename)
+        image = None
+        if signature["sources"][filename] is not None:
+            try:
+                image = pygame.transform.scale(pygame.image.load(path), (CARD_WIDTH, CARD_HEIGHT))
+            except pygame.error as e:
+                logger.error("Error loading image %s: %s", path, e)
+        if image is None:
+            logger.warning("Card image not found: %s. Creating placeholder.", path)
+            image = _deck_placeholder() if key == DECK_KEY else create_placeholder_card(*key.split("_of_"))
+
+        position = ((i % columns) * CARD_WIDTH, (i // columns) * CARD_HEIGHT)
+        atlas.blit(image, position)
+        positions[key] = position
+
+    return atlas, {"signature": signature, "sprites": positions}
+
+def _read_index():
+    try:
+        with open(ATLAS_INDEX_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_atlas(atlas, index):
+    """Stores the atlas next to the card folder; a read-only data folder just means no cache."""
+    try:
+        pygame.image.save(atlas, ATLAS_IMAGE_PATH)
+        with open(ATLAS_INDEX_PATH, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+    except (OSError, pygame.error) as e:
+        logger.warning("Could not write sprite atlas cache: %s", e)
+
+def load_atlas():
+    """Returns (atlas surface, index), decoding the cached atlas or rebuilding it when it is stale."""
+    signature = atlas_signature()
+    index = _read_index()
+    if index is not None and index.get("signature") == signature:
+        try:
+            return pygame.image.load(ATLAS_IMAGE_PATH), index
+        except (FileNotFoundError, pygame.error):
+            pass
+
+    atlas, index = build_atlas(signature)
+    _write_atlas(atlas, index)
+    return atlas, index
+
+def load_card_sprites():
+    """Returns (deck_image, {card key: image}) as subsurfaces of the sprite atlas."""
+    if not os.path.isdir(CARDS_FOLDER):
+        logger.error("Cards folder not found at %s", CARDS_FOLDER)
+        return None, {} # Return None for deck_image if folder missing
+
+    atlas, index = load_atlas()
+    if pygame.display.get_surface() is not None:
+        atlas = atlas.convert_alpha() # Fast blits need the display format, which needs a display mode
+
+    images = {
+        key: atlas.subsurface(pygame.Rect(position, (CARD_WIDTH, CARD_HEIGHT)))
+        for key, position in index["sprites"].items()
+    }
+    deck_image = images.pop(DECK_KEY)
+    return deck_image, images
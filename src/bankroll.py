@@ -0,0 +1,443 @@
+import argparse
+import csv
+import os
+import sys
+import numpy as np
+
+from constants import (
+    STARTING_BALANCE, DEFAULT_BET, DEFAULT_NUM_DECKS, AI_STRATEGY, BANKROLL_REPORT_FOLDER, WHITE, BLACK
+)
+from batch_sim import DEFAULT_LANES, BatchShoe, play_batch_round, simulate_batch
+from strategies import get_strategy, strategy_name
+from counting import get_bet_spread
+from log import get_logger, configure_logging
+
+logger = get_logger(__name__)
+
+# Bankroll analytics. Per-hand results in bets are cut into many bankroll paths whose balances
+# are cumulative sums, so the distribution of outcomes (risk of ruin, drawdowns, time to ruin,
+# percentile bands) for any starting balance and bet follows from one simulation instead
+# of playing every path again. Bets are flat, or follow a counting.BetSpread with --spread.
+#   python bankroll.py --balances 1000 2500 5000 --bets 25 50
+#   python bankroll.py --bets 10 --spread HILO_1_8
+DEFAULT_PATHS = 10_000
+DEFAULT_PATH_HANDS = 5_000
+DEFAULT_SIMULATED_HANDS = 2_000_000 # Fewer than the paths need: they are then resampled from these
+PATH_CHUNK = 500 # Paths built at a time; bounds the memory use to a few (PATH_CHUNK, hands) arrays
+SPREAD_LANE_ROUNDS = 200 # Rounds per simulator lane for a bet spread, so every lane plays through several shoes
+BAND_PERCENTILES = (5, 25, 50, 75, 95)
+BAND_POINTS = 200 # Hands at which the percentile bands are sampled
+CHART_SIZE = (800, 500)
+
+
+def unit_results(strategy=AI_STRATEGY, num_hands=DEFAULT_SIMULATED_HANDS,
+                 num_decks=DEFAULT_NUM_DECKS, rng=None):
+    """Net result per hand in bets (1.5 for a Blackjack), played with the vectorized simulator."""
+    bet = 2 # Even, so the 3:2 Blackjack payout stays exact
+    return simulate_batch(strategy, num_hands, bet, num_decks, rng=rng) / bet
+
+def spread_results(strategy=AI_STRATEGY, bet_spread=None, num_hands=DEFAULT_SIMULATED_HANDS,
+                   num_decks=DEFAULT_NUM_DECKS, rng=None):
+    """Per-hand results of betting by a bet spread on the Hi-Lo true count. Returns (units, bet_units).
+
+    bet_units is each hand's bet in base bets (the spread's units at the true count before the
+    deal) and units its net result in base bets. The vectorized simulator does not play the
+    index plays of counting.py, so only the strategy table decides.
+    """
+    spread = get_bet_spread(bet_spread)
+    table = get_strategy(strategy)
+    shoe = BatchShoe(max(1, min(DEFAULT_LANES, num_hands // SPREAD_LANE_ROUNDS)), num_decks=num_decks, rng=rng)
+    bet = 2 # Even, so the 3:2 Blackjack payout stays exact
+    units, bet_units = [np.zeros(0)], [np.zeros(0)]
+    remaining = num_hands
+    while remaining > 0:
+        shoe.check_decks() # As play_batch_round does first, so this is the count the bet is placed on
+        true_count = shoe.running_count / (np.maximum(shoe.size - shoe.cursor, 13) / 52) # As Shoe.true_count
+        multiple = np.ones(true_count.size)
+        for threshold, step_units in spread.steps: # Ascending, so the highest threshold reached wins
+            multiple = np.where(true_count >= threshold, step_units, multiple)
+        net = play_batch_round(shoe, table, bet) / bet * multiple
+        units.append(net[:remaining])
+        bet_units.append(multiple[:remaining])
+        remaining -= net.size
+    return np.concatenate(units), np.concatenate(bet_units)
+
+def bet_payouts(units, bet, bet_units=1):
+    """Per-hand payouts at a base bet, with Blackjacks paid int(stake * 1.5) like the engine.
+
+    bet_units is each hand's stake in base bets (1 for a flat bet); a Blackjack is a result of
+    1.5 times that.
+    """
+    stake = bet * bet_units
+    return np.where(units == 1.5 * bet_units, np.trunc(stake * 1.5), units * bet)
+
+def _capped_payouts(units, bet_units, bet, starting_balance):
+    """Like bet_payouts for (paths, hands) arrays, with every stake capped at the balance as the engine does.
+
+    The cap depends on the balance so far, so this steps through the hands one column at a time.
+    """
+    per_stake = units / bet_units # Net result per unit staked: 1.5 for a Blackjack
+    payouts = np.empty_like(units)
+    balance = np.full(units.shape[0], float(starting_balance))
+    for hand in range(units.shape[1]):
+        stake = np.minimum(bet * bet_units[:, hand], np.maximum(balance, 0))
+        payouts[:, hand] = np.where(per_stake[:, hand] == 1.5, np.trunc(stake * 1.5), per_stake[:, hand] * stake)
+        balance += payouts[:, hand]
+    return payouts
+
+
+def _path_blocks(units, num_paths, hands, rng):
+    """Yields (..., paths, hands) arrays of per-hand results (the last axis of units), PATH_CHUNK paths at a time.
+
+    With enough results every path is a consecutive stretch of them, which keeps the
+    correlation between hands from the same shoe; otherwise paths are bootstrapped by
+    drawing hands with replacement.
+    """
+    size = units.shape[-1]
+    consecutive = size >= num_paths * hands
+    if not consecutive:
+        logger.debug("%d results for %d paths of %d hands: resampling", size, num_paths, hands)
+    for first in range(0, num_paths, PATH_CHUNK):
+        n = min(PATH_CHUNK, num_paths - first)
+        if consecutive:
+            yield units[..., first * hands:(first + n) * hands].reshape(*units.shape[:-1], n, hands)
+        else:
+            yield units[..., rng.integers(0, size, size=(n, hands))]
+
+
+class BankrollAnalysis:
+    """Outcome distribution of bankroll paths for one starting balance and bet.
+
+    bet is the flat bet, or with a bet spread the base bet its units multiply. A path is
+    ruined by the first hand after which the balance no longer covers the (base) bet (where
+    test_ai.simulate_ai stops); it then stays at that balance. ruin_hands holds the 1-based
+    ruining hand per path, 0 for paths that survived all hands.
+    """
+    def __init__(self, starting_balance, bet, hands, strategy=None, spread=None):
+        self.starting_balance = starting_balance
+        self.bet = bet
+        self.hands = hands
+        self.strategy = strategy
+        self.spread = spread # Name of the bet spread, None for a flat bet
+        self.ruin_hands = np.zeros(0, dtype=np.int64)
+        self.max_drawdowns = np.zeros(0)
+        self.final_balances = np.zeros(0)
+        self.band_hands = np.zeros(0, dtype=np.int64)
+        self.bands = {} # percentile -> balance at each of band_hands
+
+    @property
+    def num_paths(self):
+        return self.ruin_hands.size
+
+    @property
+    def ruined(self):
+        return self.ruin_hands > 0
+
+    @property
+    def risk_of_ruin(self):
+        """Fraction of paths ruined within the horizon."""
+        return float(self.ruined.mean()) if self.num_paths else 0.0
+
+    @property
+    def risk_of_ruin_error(self):
+        """Standard error of risk_of_ruin."""
+        p = self.risk_of_ruin
+        return (p * (1 - p) / self.num_paths) ** 0.5 if self.num_paths else 0.0
+
+    def ruin_probability(self, hands):
+        """Fraction of paths ruined by the given hand number(s)."""
+        ruin_hands = np.sort(self.ruin_hands[self.ruined])
+        return np.searchsorted(ruin_hands, hands, side="right") / max(self.num_paths, 1)
+
+    def summary(self):
+        """The key numbers as a flat dict, one row of the summary table."""
+        ruin_hands = self.ruin_hands[self.ruined]
+        ruin_percentiles = np.percentile(ruin_hands, (10, 50)) if ruin_hands.size else (np.nan, np.nan)
+        drawdowns = np.percentile(self.max_drawdowns, (50, 95, 99))
+        finals = np.percentile(self.final_balances, (5, 50, 95))
+        return {
+            "strategy": self.strategy or "",
+            "starting_balance": self.starting_balance,
+            "bet": self.bet,
+            "spread": self.spread or "",
+            "units": self.starting_balance / self.bet,
+            "paths": self.num_paths,
+            "hands": self.hands,
+            "risk_of_ruin": self.risk_of_ruin,
+            "risk_of_ruin_se": self.risk_of_ruin_error,
+            "ruin_hand_p10": float(ruin_percentiles[0]),
+            "ruin_hand_median": float(ruin_percentiles[1]),
+            "max_drawdown_p50": float(drawdowns[0]),
+            "max_drawdown_p95": float(drawdowns[1]),
+            "max_drawdown_p99": float(drawdowns[2]),
+            "final_balance_mean": float(self.final_balances.mean()),
+            "final_balance_p5": float(finals[0]),
+            "final_balance_p50": float(finals[1]),
+            "final_balance_p95": float(finals[2]),
+        }
+
+    @property
+    def label(self):
+        return f"€{self.starting_balance:g} at €{self.bet:g}" + (f" {self.spread}" if self.spread else "")
+
+    @property
+    def file_stem(self):
+        return f"{self.starting_balance:g}_{self.bet:g}" + (f"_{self.spread}" if self.spread else "")
+
+
+def analyze_bankroll(units, starting_balance=STARTING_BALANCE, bet=DEFAULT_BET, num_paths=DEFAULT_PATHS,
+                     hands=DEFAULT_PATH_HANDS, seed=None, strategy=None, bet_units=None, spread=None):
+    """Builds num_paths paths of hands hands from per-hand results in bets. Returns a BankrollAnalysis.
+
+    units is e.g. unit_results(...), or net / bet of recorded rounds. For a bet spread, units and
+    bet_units come from spread_results(...) (or recorded net and bet over the base bet) and bet is
+    the base bet; like the engine, a spread bet is capped at the balance. Blackjacks are paid as the
+    engine pays them, truncated to whole units of money (see bet_payouts). With the same seed,
+    analyses of different balances and bets use the same paths.
+    """
+    if starting_balance < bet:
+        raise ValueError(f"Starting balance {starting_balance} does not cover the bet {bet}")
+    units = np.asarray(units, dtype=np.float64)
+    if units.size == 0:
+        raise ValueError("No hand results to build paths from")
+    bet_units = np.ones_like(units) if bet_units is None else np.asarray(bet_units, dtype=np.float64)
+    if bet_units.shape != units.shape:
+        raise ValueError("units and bet_units need one entry per hand")
+    flat = bool((bet_units == 1).all())
+    rng = np.random.default_rng(seed)
+    analysis = BankrollAnalysis(starting_balance, bet, hands, strategy, spread)
+    band_columns = np.unique(np.linspace(0, hands - 1, min(BAND_POINTS, hands)).astype(np.int64))
+    ruin_hands, drawdowns, finals, band_rows = [], [], [], []
+
+    for block_units, block_bet_units in _path_blocks(np.stack([units, bet_units]), num_paths, hands, rng):
+        n = block_units.shape[0]
+        if flat:
+            payouts = bet_payouts(block_units, bet)
+        else:
+            payouts = _capped_payouts(block_units, block_bet_units, bet, starting_balance)
+        balance = starting_balance + np.cumsum(payouts, axis=1)
+        broke = balance < bet
+        ruined = broke.any(axis=1)
+        first = np.where(ruined, broke.argmax(axis=1), hands - 1) # Column of the ruining hand
+        # Ruined paths stay at the balance they were ruined with
+        frozen = balance[np.arange(n), first]
+        balance = np.where(np.arange(hands) > first[:, None], frozen[:, None], balance)
+
+        peaks = np.maximum.accumulate(np.maximum(balance, starting_balance), axis=1)
+        drawdowns.append((peaks - balance).max(axis=1))
+        ruin_hands.append(np.where(ruined, first + 1, 0))
+        finals.append(balance[:, -1])
+        band_rows.append(balance[:, band_columns])
+
+    analysis.ruin_hands = np.concatenate(ruin_hands)
+    analysis.max_drawdowns = np.concatenate(drawdowns)
+    analysis.final_balances = np.concatenate(finals)
+    analysis.band_hands = band_columns + 1
+    band_balances = np.concatenate(band_rows)
+    analysis.bands = {
+        p: values for p, values in zip(BAND_PERCENTILES, np.percentile(band_balances, BAND_PERCENTILES, axis=0))
+    }
+    return analysis
+
+
+def analyze_policies(units, starting_balances=(STARTING_BALANCE,), bets=(DEFAULT_BET,), num_paths=DEFAULT_PATHS,
+                     hands=DEFAULT_PATH_HANDS, seed=None, strategy=None, bet_units=None, spread=None):
+    """One BankrollAnalysis per (starting balance, bet) that can be afforded, all on the same paths.
+
+    With bet_units and spread (see spread_results) the bets are the base bets of that spread.
+    """
+    seed = np.random.SeedSequence(seed).entropy # Same paths for every policy
+    return [
+        analyze_bankroll(units, balance, bet, num_paths, hands, seed, strategy, bet_units, spread)
+        for balance in starting_balances for bet in bets if balance >= bet
+    ]
+
+
+# --- Summary tables ---
+
+def write_summary_csv(analyses, path):
+    """Writes one summary row per analysis."""
+    rows = [analysis.summary() for analysis in analyses]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_bands_csv(analysis, path):
+    """Writes the percentile bands and the cumulative risk of ruin per sampled hand."""
+    ruin = analysis.ruin_probability(analysis.band_hands)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["hand"] + [f"p{p}" for p in BAND_PERCENTILES] + ["risk_of_ruin"])
+        for i, hand in enumerate(analysis.band_hands):
+            writer.writerow([int(hand)] + [round(float(analysis.bands[p][i]), 2) for p in BAND_PERCENTILES]
+                            + [round(float(ruin[i]), 6)])
+
+def format_summary(analyses):
+    """The summary table as text lines."""
+    lines = [f"{'balance':>9} {'bet':>6} {'units':>6} {'ruin':>14} {'ruin hand p50':>13} "
+             f"{'drawdown p95':>12} {'final p5':>9} {'final p50':>9} {'final p95':>9}"]
+    for analysis in analyses:
+        s = analysis.summary()
+        lines.append(f"{s['starting_balance']:>9g} {s['bet']:>6g} {s['units']:>6.0f} "
+                     f"{100 * s['risk_of_ruin']:>6.2f}% ±{100 * s['risk_of_ruin_se']:.2f}% "
+                     f"{s['ruin_hand_median']:>13.0f} {s['max_drawdown_p95']:>12.0f} "
+                     f"{s['final_balance_p5']:>9.0f} {s['final_balance_p50']:>9.0f} {s['final_balance_p95']:>9.0f}")
+    return lines
+
+
+# --- Charts, drawn with pygame so no plotting library is needed ---
+
+SERIES_COLORS = [(31, 119, 180), (255, 127, 14), (44, 160, 44), (214, 39, 40), (148, 103, 189), (140, 86, 75)]
+MARGINS = (70, 40, 30, 50) # left, top, right, bottom
+
+
+class _Chart:
+    """A white chart surface with axes; data coordinates map onto the plot area."""
+    def __init__(self, title, x_label, y_label, x_range, y_range, size=CHART_SIZE):
+        import pygame # Imported here so the analytics work without pygame
+        from display import get_font
+        self.pygame = pygame
+        self.surface = pygame.Surface(size)
+        self.surface.fill(WHITE)
+        left, top, right, bottom = MARGINS
+        self.area = pygame.Rect(left, top, size[0] - left - right, size[1] - top - bottom)
+        self.font = get_font(18)
+        self.x_range = x_range
+        self.y_range = (y_range[0], y_range[1] if y_range[1] > y_range[0] else y_range[0] + 1)
+
+        pygame.draw.rect(self.surface, BLACK, self.area, 1)
+        self.text(title, (size[0] // 2, top // 2), "center", get_font(24))
+        self.text(x_label, (self.area.centerx, size[1] - 14), "center")
+        self.text(y_label, (6, top - 22), "topleft")
+        for i in range(5):
+            fraction = i / 4
+            x = self.x_range[0] + fraction * (self.x_range[1] - self.x_range[0])
+            y = self.y_range[0] + fraction * (self.y_range[1] - self.y_range[0])
+            self.text(f"{x:,.0f}", (self.area.left + fraction * self.area.width, self.area.bottom + 4), "midtop")
+            self.text(f"{y:,.0f}", (self.area.left - 6, self.area.bottom - fraction * self.area.height), "midright")
+
+    def text(self, text, position, anchor, font=None):
+        rendered = (font or self.font).render(text, True, BLACK)
+        self.surface.blit(rendered, rendered.get_rect(**{anchor: position}))
+
+    def points(self, xs, ys):
+        """Screen points of data points, as a list of (x, y)."""
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        px = self.area.left + (np.asarray(xs, dtype=np.float64) - x0) / ((x1 - x0) or 1) * (self.area.width - 1)
+        py = self.area.bottom - 1 - (np.asarray(ys, dtype=np.float64) - y0) / (y1 - y0) * (self.area.height - 1)
+        return np.column_stack((px, py)).tolist()
+
+    def line(self, xs, ys, color, width=2):
+        if len(xs) > 1:
+            self.pygame.draw.lines(self.surface, color, False, self.points(xs, ys), width)
+
+    def band(self, xs, low, high, color):
+        self.pygame.draw.polygon(self.surface, color, self.points(xs, low) + self.points(xs, high)[::-1])
+
+    def bar(self, x0, x1, height, color):
+        (left, top), (right, bottom) = self.points((x0, x1), (height, self.y_range[0]))
+        self.pygame.draw.rect(self.surface, color, self.pygame.Rect(left, top, max(right - left - 1, 1), bottom - top))
+
+    def legend(self, labels):
+        for i, (label, color) in enumerate(labels):
+            x, y = self.area.left + 10, self.area.top + 8 + 20 * i
+            self.pygame.draw.rect(self.surface, color, (x, y + 4, 14, 8))
+            self.text(label, (x + 20, y), "topleft")
+
+    def save(self, path):
+        self.pygame.image.save(self.surface, path)
+
+
+def save_band_chart(analysis, path):
+    """Fan chart of the balance percentiles over the hands, with the start and ruin levels."""
+    xs, bands = analysis.band_hands, analysis.bands
+    low, high = BAND_PERCENTILES[0], BAND_PERCENTILES[-1]
+    chart = _Chart(f"Balance percentiles, {analysis.label}", "hands", "balance (€)",
+                   (0, analysis.hands), (min(0, float(bands[low].min())), float(bands[high].max())))
+    chart.band(xs, bands[low], bands[high], (198, 219, 239))
+    chart.band(xs, bands[25], bands[75], (107, 174, 214))
+    chart.line(xs, bands[50], (8, 48, 107))
+    chart.line((0, analysis.hands), (analysis.starting_balance,) * 2, (120, 120, 120), 1)
+    chart.line((0, analysis.hands), (analysis.bet,) * 2, (214, 39, 40), 1)
+    chart.legend([(f"p{low}-p{high}", (198, 219, 239)), ("p25-p75", (107, 174, 214)), ("median", (8, 48, 107)),
+                  ("start", (120, 120, 120)), ("ruin (balance < bet)", (214, 39, 40))])
+    chart.save(path)
+
+def save_histogram(values, path, title, x_label, bins=40):
+    """Histogram of values, e.g. the maximum drawdowns or the ruin hands."""
+    values = np.asarray(values, dtype=np.float64)
+    counts, edges = np.histogram(values, bins=bins) if values.size else (np.zeros(1), np.array([0.0, 1.0]))
+    chart = _Chart(title, x_label, "paths", (float(edges[0]), float(edges[-1])), (0, float(counts.max())))
+    for count, x0, x1 in zip(counts, edges[:-1], edges[1:]):
+        if count:
+            chart.bar(x0, x1, count, SERIES_COLORS[0])
+    chart.save(path)
+
+def save_ruin_chart(analyses, path):
+    """Cumulative risk of ruin over the hands, one line per analysis."""
+    hands = max(analysis.hands for analysis in analyses)
+    xs = np.linspace(0, hands, BAND_POINTS)
+    curves = [analysis.ruin_probability(xs) * 100 for analysis in analyses]
+    chart = _Chart("Risk of ruin", "hands", "ruined (%)", (0, hands), (0, max(float(c.max()) for c in curves) or 1))
+    labels = []
+    for i, (analysis, curve) in enumerate(zip(analyses, curves)):
+        color = SERIES_COLORS[i % len(SERIES_COLORS)]
+        chart.line(xs, curve, color)
+        labels.append((analysis.label, color))
+    chart.legend(labels)
+    chart.save(path)
+
+
+def write_report(analyses, folder=BANKROLL_REPORT_FOLDER):
+    """Writes the summary table, the bands per analysis and the PNG charts. Returns the written paths."""
+    os.makedirs(folder, exist_ok=True)
+    paths = [os.path.join(folder, "summary.csv"), os.path.join(folder, "risk_of_ruin.png")]
+    write_summary_csv(analyses, paths[0])
+    save_ruin_chart(analyses, paths[1])
+    for analysis in analyses:
+        stem = os.path.join(folder, analysis.file_stem)
+        write_bands_csv(analysis, f"{stem}_bands.csv")
+        save_band_chart(analysis, f"{stem}_bands.png")
+        save_histogram(analysis.max_drawdowns, f"{stem}_drawdowns.png",
+                       f"Maximum drawdown, {analysis.label}", "drawdown (€)")
+        save_histogram(analysis.ruin_hands[analysis.ruined], f"{stem}_ruin_hands.png",
+                       f"Hand of ruin, {analysis.label}", "hand")
+        paths += [f"{stem}_bands.csv", f"{stem}_bands.png", f"{stem}_drawdowns.png", f"{stem}_ruin_hands.png"]
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Risk of ruin, drawdowns and balance bands from simulated hands.")
+    parser.add_argument("--strategy", default=AI_STRATEGY, help="strategy name (default %(default)s)")
+    parser.add_argument("--balances", nargs="+", type=float, default=[STARTING_BALANCE], help="starting balances")
+    parser.add_argument("--bets", nargs="+", type=float, default=[DEFAULT_BET],
+                        help="flat bets, or the base bets of --spread")
+    parser.add_argument("--spread", default=None, help="bet spread on the true count, e.g. HILO_1_8 (default: flat)")
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS, help="bankroll paths (default %(default)s)")
+    parser.add_argument("--hands", type=int, default=DEFAULT_PATH_HANDS, help="hands per path (default %(default)s)")
+    parser.add_argument("--simulate", type=int, default=DEFAULT_SIMULATED_HANDS,
+                        help="hands to simulate (default %(default)s); paths*hands or more gives independent paths")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the simulation and the paths")
+    parser.add_argument("--out", default=BANKROLL_REPORT_FOLDER, help="output folder (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    seed = np.random.SeedSequence(args.seed)
+    print(f"Simulating {args.simulate:,} hands of {strategy_name(args.strategy)} (seed {seed.entropy})")
+    rng = np.random.default_rng(seed)
+    if args.spread:
+        units, bet_units = spread_results(args.strategy, args.spread, args.simulate, rng=rng)
+    else:
+        units, bet_units = unit_results(args.strategy, args.simulate, rng=rng), None
+    analyses = analyze_policies(units, args.balances, args.bets, args.paths, args.hands, seed.entropy,
+                                strategy_name(args.strategy), bet_units, args.spread)
+    if not analyses:
+        parser.error("no starting balance covers any of the bets")
+    print("\n".join(format_summary(analyses)))
+    write_report(analyses, args.out)
+    print(f"Report written to {args.out}.")
+    return 0
+
+if __name__ == "__main__":
+    configure_logging(ring_buffer=0)
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import numpy as np
+from constants import (
+    DEFAULT_NUM_DECKS, SHOE_PENETRATION, DEFAULT_BET, STARTING_BALANCE, DEALER_STAND_THRESHOLD
+)
+from strategies import STAND, get_strategy, strategy_name
+
+# Blackjack points per rank, in the same order as VALUES (ace..king). Aces count as 1 here;
+# the +10 for a soft hand is applied by best_totals().
+RANK_POINTS = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10], dtype=np.uint8)
+
+# Hi-Lo count value per card points (index 0 unused): 2-6 count +1, tens and aces -1
+HILO_BY_POINTS = np.array([0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1], dtype=np.int64)
+
+DEFAULT_LANES = 100_000 # Number of independent tables played side by side
+
+
+class BatchShoe:
+    """One shoe per lane, stored as a (lanes, cards) uint8 array of card points."""
+    def __init__(self, num_lanes, num_decks=DEFAULT_NUM_DECKS, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        single_shoe = np.tile(np.repeat(RANK_POINTS, 4), max(1, num_decks))
+        self.size = single_shoe.size
+        self.cards = np.tile(single_shoe, (num_lanes, 1))
+        self.cursor = np.zeros(num_lanes, dtype=np.int64)
+        self.running_count = np.zeros(num_lanes, dtype=np.int64) # Hi-Lo count of the cards dealt per lane
+        # Same cut-card rule as Shoe: reshuffle once more than the penetration has been dealt
+        self.cut_card = int(self.size * SHOE_PENETRATION)
+        self.shuffle(np.ones(num_lanes, dtype=bool))
+
+    def shuffle(self, lanes):
+        """Reshuffles the shoes of the selected lanes (boolean mask)."""
+        if not lanes.any(): return
+        self.cards[lanes] = self.rng.permuted(self.cards[lanes], axis=1)
+        self.cursor[lanes] = 0
+        self.running_count[lanes] = 0
+
+    def check_decks(self):
+        """Reshuffles every lane whose shoe is low, like check_deck between rounds."""
+        self.shuffle(self.cursor > self.cut_card)
+
+    def draw(self, lanes):
+        """Draws one card in each selected lane. Returns card points, 0 for lanes that did not draw."""
+        self.shuffle(lanes & (self.cursor >= self.size)) # Empty shoe mid-round: start a new one
+        idx = np.flatnonzero(lanes)
+        points = np.zeros(self.cursor.size, dtype=np.uint8)
+        points[idx] = self.cards[idx, self.cursor[idx]]
+        self.cursor[idx] += 1
+        self.running_count[idx] += HILO_BY_POINTS[points[idx]]
+        return points
+
+
+def best_totals(hard_totals, has_ace):
+    """Returns (best total, soft flag) arrays for hands given their hard totals and ace flags."""
+    soft = has_ace & (hard_totals + 10 <= 21)
+    return np.where(soft, hard_totals + 10, hard_totals), soft
+
+
+def stand_mask(table, totals, soft, upcards):
+    """Vectorized strategy lookup: True where the compiled strategy table says stand."""
+    return table[totals, soft.astype(np.intp), upcards] == STAND
+
+
+def dealer_finish(shoe, lanes, dealer_hard, dealer_ace):
+    """Dealer draws in the selected lanes until reaching DEALER_STAND_THRESHOLD.
+
+    dealer_hard and dealer_ace are updated in place; returns the final best totals of all lanes.
+    """
+    dealer_total, _ = best_totals(dealer_hard, dealer_ace)
+    while True:
+        hitting = lanes & (dealer_total < DEALER_STAND_THRESHOLD)
+        if not hitting.any(): return dealer_total
+        card = shoe.draw(hitting)
+        dealer_hard += card
+        dealer_ace |= card == 1
+        dealer_total, _ = best_totals(dealer_hard, dealer_ace)
+
+
+def settle(player_total, dealer_total, player_bj, dealer_bj, bet_amount=DEFAULT_BET):
+    """Net result per lane, with the same order of checks as BlackjackEngine.resolve_round."""
+    bet = int(bet_amount)
+    net = np.where(player_total > dealer_total, bet, np.where(player_total < dealer_total, -bet, 0))
+    net = np.where(dealer_total > 21, bet, net)
+    net = np.where(player_total > 21, -bet, net)
+    net = np.where(dealer_bj, -bet, net)
+    net = np.where(player_bj, int(bet * 1.5), net)
+    net = np.where(player_bj & dealer_bj, 0, net)
+    return net.astype(np.int64)
+
+
+def play_batch_round(shoe, strategy, bet_amount=DEFAULT_BET):
+    """Plays one round in every lane of the shoe. Returns the net result per lane (int64).
+
+    strategy is a registered strategy name or a compiled table (see strategies.py).
+    """
+    table = get_strategy(strategy)
+    lanes = shoe.cursor.size
+    everyone = np.ones(lanes, dtype=bool)
+    shoe.check_decks()
+
+    # Deal order matches deal_initial_cards: player, dealer, player, dealer
+    p1, d1, p2, d2 = (shoe.draw(everyone) for _ in range(4))
+    player_hard = p1.astype(np.int64) + p2
+    player_ace = (p1 == 1) | (p2 == 1)
+    dealer_hard = d1.astype(np.int64) + d2
+    dealer_ace = (d1 == 1) | (d2 == 1)
+    upcards = np.where(d1 == 1, 11, d1).astype(np.int64) # Ace counts as 11 for strategy lookup
+
+    player_total, player_soft = best_totals(player_hard, player_ace)
+    dealer_total, _ = best_totals(dealer_hard, dealer_ace)
+    player_bj = player_total == 21
+    dealer_bj = dealer_total == 21
+
+    # Player turn: lanes keep hitting until they stand, bust or reach 21
+    active = ~(player_bj | dealer_bj)
+    while True:
+        active &= player_total < 21
+        hitting = active & ~stand_mask(table, player_total, player_soft, upcards)
+        if not hitting.any(): break
+        card = shoe.draw(hitting)
+        player_hard += card
+        player_ace |= card == 1
+        player_total, player_soft = best_totals(player_hard, player_ace)
+        active = hitting
+
+    # Dealer turn: only for lanes where the player did not bust and nobody had Blackjack
+    dealer_active = ~(player_bj | dealer_bj) & (player_total <= 21)
+    dealer_total = dealer_finish(shoe, dealer_active, dealer_hard, dealer_ace)
+    return settle(player_total, dealer_total, player_bj, dealer_bj, bet_amount)
+
+
+def play_common_round(shoe, strategies, bet_amount=DEFAULT_BET):
+    """Plays one round of every strategy on the same cards (common random numbers).
+
+    In each lane every strategy starts from the same shoe position, so all of them get the
+    same initial cards and draw hits from the same card sequence; afterwards the shoe moves on
+    past the cards of the strategy that used the most. The card luck then largely cancels
+    in the differences between strategies. Returns a (strategies, lanes) int64 array.
+    (A lane whose shoe runs out mid-round is reshuffled for the strategies after it, so that
+    round is not on common cards; with the cut card this is rare.)
+    """
+    shoe.check_decks()
+    cursor, running_count = shoe.cursor.copy(), shoe.running_count.copy()
+    net = np.empty((len(strategies), cursor.size), dtype=np.int64)
+    end_cursors = np.empty_like(net)
+    end_counts = np.empty_like(net)
+    for i, strategy in enumerate(strategies):
+        shoe.cursor[:], shoe.running_count[:] = cursor, running_count
+        net[i] = play_batch_round(shoe, strategy, bet_amount)
+        end_cursors[i], end_counts[i] = shoe.cursor, shoe.running_count
+    furthest = end_cursors.argmax(axis=0)
+    lanes = np.arange(cursor.size)
+    shoe.cursor[:] = end_cursors[furthest, lanes]
+    shoe.running_count[:] = end_counts[furthest, lanes]
+    return net
+
+
+def iter_batches(strategy, num_hands, bet_amount=DEFAULT_BET, num_decks=DEFAULT_NUM_DECKS,
+                 lanes=DEFAULT_LANES, rng=None):
+    """Yields arrays of per-hand net results until num_hands hands have been played."""
+    shoe = BatchShoe(min(lanes, num_hands), num_decks=num_decks, rng=rng)
+    strategy = get_strategy(strategy) # Resolve the table once, not per round
+    remaining = num_hands
+    while remaining > 0:
+        net = play_batch_round(shoe, strategy, bet_amount)
+        yield net[:remaining]
+        remaining -= net.size
+
+
+def iter_common_batches(strategies, num_hands, bet_amount=DEFAULT_BET, num_decks=DEFAULT_NUM_DECKS,
+                        lanes=DEFAULT_LANES, rng=None):
+    """Like iter_batches for several strategies on common cards: yields (strategies, hands) arrays."""
+    shoe = BatchShoe(min(lanes, num_hands), num_decks=num_decks, rng=rng)
+    strategies = [get_strategy(strategy) for strategy in strategies]
+    remaining = num_hands
+    while remaining > 0:
+        net = play_common_round(shoe, strategies, bet_amount)
+        yield net[:, :remaining]
+        remaining -= net.shape[1]
+
+
+def simulate_batch(strategy, num_hands, bet_amount=DEFAULT_BET, num_decks=DEFAULT_NUM_DECKS,
+                   lanes=DEFAULT_LANES, rng=None):
+    """Plays num_hands independent hands and returns their net results as one int64 array."""
+    if num_hands <= 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(list(iter_batches(strategy, num_hands, bet_amount, num_decks, lanes, rng)))
+
+
+def simulate_common_batch(strategies, num_hands, bet_amount=DEFAULT_BET, num_decks=DEFAULT_NUM_DECKS,
+                          lanes=DEFAULT_LANES, rng=None):
+    """Plays num_hands hands of every strategy on the same cards. Returns {strategy name: net results}."""
+    blocks = list(iter_common_batches(strategies, num_hands, bet_amount, num_decks, lanes, rng))
+    net = np.concatenate(blocks, axis=1) if blocks else np.zeros((len(strategies), 0), dtype=np.int64)
+    return {strategy_name(strategy): row for strategy, row in zip(strategies, net)}
+
+
+def results_table(strategy, net, bet_amount=DEFAULT_BET, starting_balance=STARTING_BALANCE,
+                  stop_on_ruin=True):
+    """Turns per-hand net results into the per-round columns written by test_ai.
+
+    The hands are treated as one sequence of rounds played from starting_balance.
+    With stop_on_ruin the table ends before the first round that could not be afforded,
+    like simulate_ai does.
+    """
+    new_balance = starting_balance + np.cumsum(net, dtype=np.int64)
+    old_balance = new_balance - net
+    if stop_on_ruin:
+        broke = np.flatnonzero(old_balance < bet_amount)
+        if broke.size:
+            net, old_balance, new_balance = net[:broke[0]], old_balance[:broke[0]], new_balance[:broke[0]]
+
+    result = np.where(net > 0, "win", np.where(net < 0, "loss", "push"))
+    return {
+        "round": np.arange(1, net.size + 1, dtype=np.int64),
+        "ai_strategy": np.full(net.size, strategy_name(strategy)),
+        "bet": np.full(net.size, bet_amount, dtype=np.int64),
+        "old_balance": old_balance,
+        "new_balance": new_balance,
+        "result": result,
+    }
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from constants import (
+    DATA_FOLDER, DEFAULT_NUM_DECKS, DEFAULT_BET, STRAT_DEALER_MIMIC, STRAT_NEVER_BUST,
+    STRAT_BASIC_HARD, STRAT_CAUTIOUS, STRAT_AGGRESSIVE, STRAT_OPTIMAL
+)
+
+# Performance benchmarks with stored baselines.
+#   python benchmark.py --update          measure and save the baseline for this machine
+#   python benchmark.py                   measure and exit with status 1 if any metric regressed
+# Every metric is the best of a few repeats, which is the least noisy estimate of what the code costs.
+BASELINE_PATH = os.path.join(DATA_FOLDER, "benchmark_baseline.json")
+DEFAULT_TOLERANCE = 0.25 # Allowed relative slowdown before a metric counts as regressed
+REPEATS = 5
+
+BENCHMARKS = {} # name -> (function, unit, higher_is_better)
+
+
+def benchmark(name, unit, higher_is_better=False):
+    """Registers a benchmark function returning one value (or a dict of sub-metric values)."""
+    def register(function):
+        BENCHMARKS[name] = (function, unit, higher_is_better)
+        return function
+    return register
+
+def best_time(function, repeats=REPEATS):
+    """Shortest wall time in seconds of repeated calls to function()."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@benchmark("engine_rounds_per_s", "rounds/s", higher_is_better=True)
+def bench_engine_rounds(rounds=20_000):
+    """Complete AI rounds of the headless engine (no rendering)."""
+    from engine import BlackjackEngine
+    engine = BlackjackEngine(strategy=STRAT_BASIC_HARD, seed=1)
+    def play():
+        for _ in range(rounds):
+            engine.play_round(DEFAULT_BET)
+            engine.balance = 1_000_000 # Never stop for lack of funds
+    return rounds / best_time(play)
+
+@benchmark("calculate_hand_value_per_s", "hands/s", higher_is_better=True)
+def bench_hand_value(hands=50_000):
+    """utils.calculate_hand_value on two- to four-card hands."""
+    import random
+    from utils import create_deck, calculate_hand_value
+    deck = create_deck(DEFAULT_NUM_DECKS, rng=random.Random(1))
+    starts = len(deck) - 4
+    samples = [deck[i % starts:i % starts + 2 + i % 3] for i in range(hands)]
+    def evaluate():
+        for hand in samples:
+            calculate_hand_value(hand)
+    return len(samples) / best_time(evaluate)
+
+@benchmark("shuffle_per_s", "shoes/s", higher_is_better=True)
+def bench_shuffle(shoes=500):
+    """Deck creation and shuffling: the list-based utils.create_deck and the array-backed Shoe."""
+    import random
+    import numpy as np
+    from utils import create_deck
+    from shoe import Shoe
+    rng = random.Random(1)
+    shoe = Shoe(DEFAULT_NUM_DECKS, rng=np.random.default_rng(1))
+    def create():
+        for _ in range(shoes):
+            create_deck(DEFAULT_NUM_DECKS, rng=rng)
+    def shuffle():
+        for _ in range(shoes):
+            shoe.shuffle()
+    return {"create_deck": shoes / best_time(create), "shoe_shuffle": shoes / best_time(shuffle)}
+
+@benchmark("ai_decision_us", "us/decision")
+def bench_ai_decisions(decisions=5_000):
+    """player_ai_action latency per strategy, timing only the decision itself.
+
+    OPTIMAL starts every repeat with empty EV caches, so it includes filling them.
+    """
+    import ev
+    from engine import BlackjackEngine
+    latencies = {}
+    strategies = [STRAT_DEALER_MIMIC, STRAT_NEVER_BUST, STRAT_BASIC_HARD, STRAT_CAUTIOUS, STRAT_AGGRESSIVE, STRAT_OPTIMAL]
+    for strategy in strategies:
+        count = decisions // 50 if strategy == STRAT_OPTIMAL else decisions # Exact EVs are far slower
+        engine = BlackjackEngine(strategy=strategy, seed=1)
+        def decide():
+            ev.clear_caches()
+            spent, made = 0, 0
+            while made < count:
+                engine.reset_round()
+                engine.place_bet(DEFAULT_BET)
+                engine.deal_initial_cards()
+                while engine.game_state == "PLAYER_TURN" and made < count:
+                    start = time.perf_counter()
+                    engine.player_ai_action()
+                    spent += time.perf_counter() - start
+                    made += 1
+            return spent
+        latencies[strategy] = min(decide() for _ in range(REPEATS)) / count * 1e6
+    return latencies
+
+@benchmark("render_frame_ms", "ms/frame")
+def bench_render(frames=200):
+    """BlackjackEnv.render with the dummy SDL video driver: full repaints and unchanged frames."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    from display import init_display
+    from blackjack_env import BlackjackEnv
+    init_display()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    env = BlackjackEnv(seed=1)
+    env.place_bet(DEFAULT_BET)
+    env.deal_initial_cards()
+    env.render(screen)
+    def full():
+        for _ in range(frames):
+            env.renderer.invalidate()
+            env.render(screen)
+    def idle():
+        for _ in range(frames):
+            env.render(screen)
+    return {"full": best_time(full) / frames * 1e3, "idle": best_time(idle) / frames * 1e3}
+
+@benchmark("load_card_images_ms", "ms")
+def bench_load_images():
+    """load_card_images in a fresh interpreter (display mode set).
+
+    cold builds the atlas from the card files (an empty cache folder per repeat);
+    warm decodes the atlas cached in the data folder.
+    """
+    code = (
+        "import os, sys, time; os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')\n"
+        "import pygame; pygame.init(); pygame.display.set_mode((1, 1))\n"
+        "import constants\n"
+        "if len(sys.argv) > 1: constants.ATLAS_IMAGE_PATH, constants.ATLAS_INDEX_PATH = sys.argv[1:3]\n"
+        "start = time.perf_counter()\n"
+        "from utils import load_card_images; load_card_images()\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    def load(*cache_paths):
+        output = subprocess.run([sys.executable, "-c", code, *cache_paths], cwd=here,
+                                capture_output=True, text=True, check=True)
+        return float(output.stdout.strip().splitlines()[-1])
+    cold = []
+    for _ in range(REPEATS):
+        with tempfile.TemporaryDirectory() as cache:
+            cold.append(load(os.path.join(cache, "atlas.png"), os.path.join(cache, "atlas.json")))
+    warm = [load() for _ in range(REPEATS)]
+    return {"cold": min(cold) * 1e3, "warm": min(warm) * 1e3}
+
+
+def run_benchmarks(names=None):
+    """Runs the selected (default: all) benchmarks. Returns {metric: {"value", "unit", "higher_is_better"}}."""
+    results = {}
+    for name, (function, unit, higher_is_better) in BENCHMARKS.items():
+        if names and name not in names: continue
+        print(f"Running {name}...")
+        value = function()
+        values = value if isinstance(value, dict) else {None: value}
+        for sub, v in values.items():
+            metric = name if sub is None else f"{name}.{sub}"
+            results[metric] = {"value": v, "unit": unit, "higher_is_better": higher_is_better}
+    return results
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Returns a message for every metric that is more than tolerance worse than its baseline."""
+    regressions = []
+    for metric, result in results.items():
+        base = baseline.get(metric)
+        if base is None: continue
+        if result["higher_is_better"]:
+            change = base["value"] / result["value"] - 1 if result["value"] > 0 else float("inf")
+        else:
+            change = result["value"] / base["value"] - 1 if base["value"] > 0 else 0.0
+        if change > tolerance:
+            regressions.append(f"{metric}: {result['value']:.4g} {result['unit']} vs baseline "
+                               f"{base['value']:.4g} ({change:+.0%} slower, tolerance {tolerance:.0%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks against a stored baseline.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown per metric (default %(default)s)")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only)
+    for metric, result in results.items():
+        print(f"{metric:40s} {result['value']:12.4g} {result['unit']}")
+
+    if args.update or not os.path.exists(args.baseline):
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results) # Keep metrics that were not run this time
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {args.baseline}.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__": sys.exit(main())
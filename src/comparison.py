@@ -0,0 +1,196 @@
+from itertools import combinations
+from statistics import NormalDist
+import numpy as np
+
+from constants import DEFAULT_BET, DEFAULT_NUM_DECKS
+from batch_sim import BatchShoe, iter_batches, play_common_round
+from strategies import get_strategy
+from results import RunningStats
+from log import get_logger
+
+logger = get_logger(__name__)
+
+# Sequential comparison of strategies: play them in batches with the vectorized simulator and
+# stop as soon as the answer is known, instead of a fixed number of rounds per strategy.
+DEFAULT_PRECISION = 0.005 # Target half-width of the confidence intervals, in bets per hand
+DEFAULT_CONFIDENCE = 0.99 # High, because the intervals are looked at after every batch
+DEFAULT_BATCH_HANDS = 100_000
+DEFAULT_MIN_HANDS = 200_000 # Before this, the normal approximation of the intervals is not trusted
+DEFAULT_MAX_HANDS = 100_000_000
+
+SEPARATED = "separated"
+EQUIVALENT = "equal within precision"
+UNDECIDED = "undecided"
+
+
+class PairComparison:
+    """Difference in EV per hand between two strategies, with its confidence interval."""
+    def __init__(self, first, second, paired=False):
+        self.first = first
+        self.second = second
+        # With common cards the hands of the two strategies are paired: track the per-hand differences
+        self.differences = RunningStats() if paired else None
+        self.difference = 0.0
+        self.half_width = float("inf")
+        self.status = UNDECIDED
+
+    def update(self, stats, z, precision, bet_amount=DEFAULT_BET):
+        if self.differences is not None:
+            d = self.differences
+            if d.rounds < 2: return
+            self.difference = d.mean / bet_amount
+            self.half_width = z * (d.variance / d.rounds) ** 0.5 / bet_amount
+        else:
+            a, b = stats[self.first], stats[self.second]
+            self.difference = (a.mean - b.mean) / bet_amount
+            # Independent samples: the variances of the two means add up
+            self.half_width = z * (a.variance / a.rounds + b.variance / b.rounds) ** 0.5 / bet_amount
+        if abs(self.difference) > self.half_width:
+            self.status = SEPARATED
+        elif self.half_width <= precision:
+            self.status = EQUIVALENT
+        else:
+            self.status = UNDECIDED
+
+    @property
+    def resolved(self):
+        return self.status != UNDECIDED
+
+    @property
+    def better(self):
+        """The strategy with the higher EV if the two are separated, else None."""
+        if self.status != SEPARATED: return None
+        return self.first if self.difference > 0 else self.second
+
+    def __repr__(self):
+        return (f"{self.first} - {self.second}: {self.difference:+.4f} ± {self.half_width:.4f} ({self.status})")
+
+
+class StrategyComparison:
+    """Plays strategies in batches until every EV and every pairwise difference is decided.
+
+    After each batch the EV per hand (in bets) of each strategy gets a normal confidence
+    interval, and so does every pairwise difference; the pair intervals are Bonferroni-corrected
+    for the number of pairs. A pair is decided once its interval excludes 0 (separated) or is
+    narrower than precision (equal within precision). A strategy keeps playing while its own
+    interval is wider than precision or any of its pairs is undecided, up to max_hands.
+    Checking after every batch makes the nominal confidence somewhat optimistic, hence the
+    high default.
+
+    With common_shoes (the default) the active strategies play every batch on the same cards
+    (see batch_sim.play_common_round) and each pair is judged on its per-hand differences,
+    which are far less noisy than two independent runs, so close strategies separate with
+    many fewer hands. Otherwise every strategy gets its own independent RNG stream.
+    """
+    def __init__(self, strategies, precision=DEFAULT_PRECISION, confidence=DEFAULT_CONFIDENCE,
+                 batch_hands=DEFAULT_BATCH_HANDS, min_hands=DEFAULT_MIN_HANDS, max_hands=DEFAULT_MAX_HANDS,
+                 bet_amount=DEFAULT_BET, num_decks=DEFAULT_NUM_DECKS, seed=None, common_shoes=True):
+        self.strategies = list(dict.fromkeys(strategies))
+        self.precision = precision
+        self.min_hands = min_hands
+        self.max_hands = max_hands
+        self.bet_amount = bet_amount
+        self.stats = {strategy: RunningStats() for strategy in self.strategies} # Net results in money
+        self.common_shoes = common_shoes
+        self.pairs = [PairComparison(a, b, common_shoes) for a, b in combinations(self.strategies, 2)]
+        alpha = 1 - confidence
+        self.z = NormalDist().inv_cdf(1 - alpha / 2)
+        self.pair_z = NormalDist().inv_cdf(1 - alpha / 2 / max(len(self.pairs), 1))
+
+        self.seed_sequence = np.random.SeedSequence(seed) # entropy reproduces the run when seed was None
+        if common_shoes:
+            self._shoe = BatchShoe(batch_hands, num_decks, rng=np.random.default_rng(self.seed_sequence))
+            self._tables = {strategy: get_strategy(strategy) for strategy in self.strategies}
+        else:
+            seeds = self.seed_sequence.spawn(len(self.strategies))
+            self._batches = {
+                strategy: iter_batches(strategy, max_hands, bet_amount, num_decks, lanes=batch_hands,
+                                       rng=np.random.default_rng(child))
+                for strategy, child in zip(self.strategies, seeds)
+            }
+
+    def half_width(self, strategy):
+        """Half-width of the confidence interval of a strategy's EV per hand."""
+        stats = self.stats[strategy]
+        if stats.rounds < 2: return float("inf")
+        return self.z * (stats.variance / stats.rounds) ** 0.5 / self.bet_amount
+
+    def ev(self, strategy):
+        """Estimated EV per hand of a strategy, in bets."""
+        return self.stats[strategy].mean / self.bet_amount
+
+    def active(self, strategy):
+        """Whether the strategy still needs hands."""
+        stats = self.stats[strategy]
+        if stats.rounds >= self.max_hands: return False
+        if stats.rounds < self.min_hands: return True
+        if self.half_width(strategy) > self.precision: return True
+        return any(not pair.resolved for pair in self.pairs if strategy in (pair.first, pair.second))
+
+    def step(self):
+        """Plays one batch of every active strategy. Returns False once none is active."""
+        active = [strategy for strategy in self.strategies if self.active(strategy)]
+        if self.common_shoes:
+            self._step_common(active)
+        else:
+            for strategy in active:
+                net = next(self._batches[strategy], None)
+                if net is not None:
+                    self.stats[strategy].update_batch(net)
+        if all(stats.rounds >= 2 for stats in self.stats.values()):
+            for pair in self.pairs:
+                pair.update(self.stats, self.pair_z, self.precision, self.bet_amount)
+        return bool(active)
+
+    def _step_common(self, active):
+        if not active: return
+        net = play_common_round(self._shoe, [self._tables[strategy] for strategy in active], self.bet_amount)
+        rows = dict(zip(active, net))
+        for strategy, row in rows.items():
+            self.stats[strategy].update_batch(row)
+        for pair in self.pairs:
+            if pair.first in rows and pair.second in rows:
+                pair.differences.update_batch(rows[pair.first] - rows[pair.second])
+
+    def run(self, verbose=False):
+        """Steps until every strategy is done. Returns the summary (see summary())."""
+        batch = 0
+        while self.step():
+            batch += 1
+            if verbose and batch % 10 == 0:
+                hands = sum(stats.rounds for stats in self.stats.values())
+                undecided = sum(not pair.resolved for pair in self.pairs)
+                logger.info("Batch %d: %d hands played, %d undecided pairs", batch, hands, undecided)
+        return self.summary()
+
+    def ranking(self):
+        """Strategies from the highest to the lowest estimated EV."""
+        return sorted(self.strategies, key=lambda strategy: -self.stats[strategy].mean)
+
+    def summary(self):
+        """{"strategies": {name: {"hands", "ev", "half_width"}}, "pairs": [PairComparison], "ranking": [names]}"""
+        return {
+            "strategies": {
+                strategy: {"hands": self.stats[strategy].rounds, "ev": self.ev(strategy),
+                           "half_width": self.half_width(strategy)}
+                for strategy in self.strategies
+            },
+            "pairs": self.pairs,
+            "ranking": self.ranking(),
+        }
+
+    def report(self):
+        """The result as text lines."""
+        lines = []
+        for strategy in self.ranking():
+            lines.append(f"{strategy:15s} EV {self.ev(strategy):+.4f} ± {self.half_width(strategy):.4f} "
+                         f"bets/hand over {self.stats[strategy].rounds} hands")
+        lines.extend(repr(pair) for pair in self.pairs)
+        return lines
+
+
+def compare_strategies(strategies, verbose=False, **options):
+    """Runs a StrategyComparison (options as its constructor) and returns it."""
+    comparison = StrategyComparison(strategies, **options)
+    comparison.run(verbose)
+    return comparison
@@ -1,10 +1,8 @@
-import pygame
 import os
 import pathlib
 
-# Pygame-instellingen
-pygame.init() # Initialize Pygame early for font loading if needed immediately
-pygame.font.init() # Explicitly initialize font module
+# Alleen instellingen: dit bestand importeert geen pygame, zodat de spellogica en simulaties
+# zonder SDL kunnen draaien. Fonts en pygame worden pas geladen als er gerenderd wordt (display.py).
 
 # Screen Dimensions
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
@@ -21,11 +19,14 @@ DECK_POS = (SCREEN_WIDTH - CARD_WIDTH - MARGIN, MARGIN)
 PLAYER_CARD_START_POS = (300, 400)
 DEALER_CARD_START_POS = (300, 100)
 CARD_SPACING = 80 # Horizontal spacing between cards
+TABLE_SEAT_Y = 362 # Top of the first card of each seat at a multi-seat table
+TABLE_CARD_CASCADE = (12, 10) # Offset between a seat's cards, which overlap to fit up to 7 seats
 MAX_CARDS_DISPLAY = 5 # Max cards to display per hand visually
 
-# Font
-FONT = pygame.font.Font(None, 36)
-SMALL_FONT = pygame.font.Font(None, 24) # Added for potentially smaller text
+# Font sizes (fonts themselves are created on first use, see display.get_font)
+FONT_SIZE = 36
+SMALL_FONT_SIZE = 24 # Added for potentially smaller text
+PLACEHOLDER_FONT_SIZE = 18
 
 # Paths
 BASE_DIR = pathlib.Path(__file__).parent.parent 
@@ -33,17 +34,47 @@ DATA_FOLDER = os.path.join(BASE_DIR, "data")
 CARDS_FOLDER = os.path.join(DATA_FOLDER, "cards")
 DECK_IMAGE_FILENAME = "back_of_card.png"
 DECK_IMAGE_PATH = os.path.join(CARDS_FOLDER, DECK_IMAGE_FILENAME)
+# Pre-scaled sprite atlas built from CARDS_FOLDER on first start (see assets.py)
+ATLAS_IMAGE_PATH = os.path.join(DATA_FOLDER, "cards_atlas.png")
+ATLAS_INDEX_PATH = os.path.join(DATA_FOLDER, "cards_atlas.json")
 
 
 # Game Settings
 SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
 VALUES = ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']
 DEFAULT_NUM_DECKS = 3
+SHOE_PENETRATION = 0.75 # Fraction of the shoe dealt before the cut card triggers a reshuffle
 DEALER_STAND_THRESHOLD = 17
 PLAYER_AI_STAND_THRESHOLD = 17 # For the simple AI
 
 # Animation
-CARD_ANIMATION_SPEED = 10 # Lower is faster for division-based movement
+CARD_ANIMATION_MS = 400 # Time a card takes to fly from the deck to its place
+
+# Pacing (ms) of the GUI timeline (see scheduler.py)
+BET_TO_DEAL_DELAY_MS = 200   # After placing a bet, before the first card
+DEAL_CARD_DELAY_MS = 100     # Between the cards of the initial deal
+AI_THINK_DELAY_MS = 400      # Before the AI player acts
+DEALER_HIT_DELAY_MS = 700    # Before and after each dealer hit
+DEALER_STAND_DELAY_MS = 1000 # Showing "Dealer Stands" before the round is resolved
+ROUND_RESET_DELAY_MS = 2500  # Showing the result before the next round starts
+
+# --- Logging (see log.py) ---
+LOG_LEVEL = "INFO"     # DEBUG also shows every dealer step and reshuffle; WARNING keeps simulations quiet
+LOG_FILE = None        # Also write the log to this file, e.g. os.path.join(DATA_FOLDER, "blackjack.log")
+LOG_FILE_BUFFER = 1000 # Records collected before they are written to the log file at once
+LOG_RING_BUFFER = 200  # Recent records kept in memory for the log panel (L) and crash dumps; 0 = none
+CRASH_LOG_PATH = os.path.join(DATA_FOLDER, "crash.log") # Recent records are dumped here if the game crashes
+
+# --- Profiling (see profiler.py) ---
+SHOW_PERF_OVERLAY = False     # Start with the performance overlay and profiling on (toggle with P)
+PERF_OVERLAY_REFRESH_MS = 500 # How often the overlay text is updated
+
+# --- Turbo mode (see turbo.py): T plays rounds at full speed without animation ---
+TURBO_FRAME_BUDGET_MS = 12 # Time per frame spent playing rounds; the rest is left for the panel and events
+TURBO_CURVE_POINTS = 400   # Points kept of the balance curve (older parts are thinned out)
+
+# Exact EV analysis (ev.py): entries kept in each memoization cache
+DEALER_CACHE_SIZE = 200_000
 
 # Balance & Bet
 STARTING_BALANCE = 1000
@@ -55,6 +86,7 @@ STRAT_NEVER_BUST = "NEVER_BUST"
 STRAT_BASIC_HARD = "BASIC_HARD" # Simplified basic strategy for hard hands
 STRAT_CAUTIOUS = "CAUTIOUS"     # More conservative based on dealer card
 STRAT_AGGRESSIVE = "AGGRESSIVE"   # Hits more often
+STRAT_OPTIMAL = "OPTIMAL"         # Exact EV-maximizing play for the current shoe composition (see ev.py)
 # Threshold for the Dealer Mimic strategy (can be kept if useful)
 PLAYER_AI_STAND_THRESHOLD = 17
 
@@ -62,3 +94,21 @@ PLAYER_AI_STAND_THRESHOLD = 17
 # AI Strategy
 # Choose one of the strategies for the AI player
 AI_STRATEGY = STRAT_BASIC_HARD
+
+# Card counting (see counting.py): bet spreads keyed on the Hi-Lo true count and index plays
+BET_SPREAD_FLAT = "FLAT"         # Always DEFAULT_BET
+BET_SPREAD_HILO = "HILO_1_8"     # 1 unit below true count +1, up to 8 units from +4
+DEVIATIONS_HILO = "HILO_I18"     # Hit/stand index plays of the Illustrious 18
+AI_BET_SPREAD = BET_SPREAD_FLAT
+AI_DEVIATIONS = None             # None plays the strategy table as is
+
+# Multi-seat tables (see table.py): all seats share one shoe and one dealer hand
+TABLE_MAX_SEATS = 7
+NUM_SEATS = 1 # Seats in the GUI; more than 1 shows a full table of AI seats
+
+# --- Hand history (see history.py) ---
+HAND_HISTORY_PATH = None # Append every GUI round to this binary log, e.g. os.path.join(DATA_FOLDER, "hands.bin")
+REPLAY_HISTORY_PATH = None # Replay the rounds of this log in the GUI instead of playing
+
+# --- Bankroll analytics (see bankroll.py) ---
+BANKROLL_REPORT_FOLDER = os.path.join(DATA_FOLDER, "bankroll") # Summary tables and PNG charts
@@ -0,0 +1,69 @@
+from constants import DEFAULT_BET, BET_SPREAD_FLAT, BET_SPREAD_HILO, DEVIATIONS_HILO
+from strategies import STAND, HIT
+
+
+class BetSpread:
+    """Bet sizing keyed on the true count.
+
+    steps are (true count threshold, units) pairs; the bet is base_bet times the units of
+    the highest threshold reached, or one unit below the first threshold.
+    """
+    def __init__(self, steps=(), base_bet=DEFAULT_BET):
+        self.steps = tuple(sorted(steps))
+        self.base_bet = base_bet
+
+    def bet(self, true_count, balance=None):
+        """Bet for the given true count, capped at the balance if one is given."""
+        units = 1
+        for threshold, step_units in self.steps:
+            if true_count < threshold: break
+            units = step_units
+        amount = units * self.base_bet
+        return amount if balance is None else min(amount, balance)
+
+    def __repr__(self):
+        return f"BetSpread({self.steps}, base_bet={self.base_bet})"
+
+
+BET_SPREADS = {
+    BET_SPREAD_FLAT: BetSpread(),
+    BET_SPREAD_HILO: BetSpread(((1, 2), (2, 4), (3, 6), (4, 8))),
+}
+
+# Index plays: {(player total, soft, dealer upcard): index}. Stand when the true count is at
+# or above the index, hit below it; states without an entry follow the strategy table.
+DEVIATION_SETS = {
+    DEVIATIONS_HILO: {
+        (16, False, 10): 0, (15, False, 10): 4, (16, False, 9): 5,
+        (13, False, 2): -1, (13, False, 3): -2,
+        (12, False, 2): 3, (12, False, 3): 2, (12, False, 4): 0, (12, False, 5): -2, (12, False, 6): -1,
+    },
+}
+
+
+def get_bet_spread(spread):
+    """Returns the BetSpread for a registered name, or the spread itself."""
+    if isinstance(spread, str):
+        try:
+            return BET_SPREADS[spread]
+        except KeyError:
+            raise KeyError(f"Unknown bet spread '{spread}'. Registered: {', '.join(BET_SPREADS)}") from None
+    return spread
+
+def get_deviations(deviations):
+    """Returns the index plays for a registered name or a dict; None means no deviations."""
+    if deviations is None:
+        return {}
+    if isinstance(deviations, str):
+        try:
+            return DEVIATION_SETS[deviations]
+        except KeyError:
+            raise KeyError(f"Unknown deviation set '{deviations}'. Registered: {', '.join(DEVIATION_SETS)}") from None
+    return dict(deviations)
+
+def apply_deviation(deviations, action, total, soft, upcard, true_count):
+    """Overrides the table action with an index play for this state, if there is one."""
+    index = deviations.get((total, soft, upcard))
+    if index is None:
+        return action
+    return STAND if true_count >= index else HIT
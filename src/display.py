@@ -0,0 +1,21 @@
+import pygame
+from constants import FONT_SIZE
+
+# Display resources, created on first use so that importing the game logic never initializes SDL
+_fonts = {}
+
+
+def init_display():
+    """Initializes the pygame modules needed for drawing. Safe to call more than once."""
+    if not pygame.get_init():
+        pygame.init()
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+def get_font(size=FONT_SIZE):
+    """Default font at the given size, loaded once."""
+    font = _fonts.get(size)
+    if font is None:
+        init_display()
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
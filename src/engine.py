@@ -0,0 +1,256 @@
+import numpy as np
+from constants import (
+    DEFAULT_NUM_DECKS, SHOE_PENETRATION, DEALER_STAND_THRESHOLD,
+    STARTING_BALANCE, AI_STRATEGY, AI_BET_SPREAD, AI_DEVIATIONS
+)
+from hand import Hand, card_points
+from shoe import Shoe, HILO_BY_CODE
+from strategies import STAND, HIT, resolve_strategy, strategy_name
+from counting import get_bet_spread, get_deviations, apply_deviation
+import ev
+
+def settle_hand(player_hand, dealer_hand, bet):
+    """Payout of a finished player hand against the dealer's hand. Returns (payout, result message)."""
+    player_score = player_hand.total
+    dealer_score = dealer_hand.total
+    player_bj = player_hand.is_blackjack
+    dealer_bj = dealer_hand.is_blackjack
+
+    if player_bj and dealer_bj:
+        return 0, "Push! Both have Blackjack!"  # Bet returned
+    if player_bj:
+        return int(bet * 1.5), "Player Blackjack! 🎉"  # BJ betaalt 3:2
+    if dealer_bj:
+        return -bet, "Dealer Blackjack! 😢"  # Inzet kwijt
+    if player_score > 21:
+        return -bet, "Player Busts! Dealer wins."  # Inzet kwijt
+    if dealer_score > 21:
+        return bet, "Dealer Busts! Player wins!"  # Even money
+    if player_score > dealer_score:
+        return bet, "Player wins!"  # Even money
+    if dealer_score > player_score:
+        return -bet, "Dealer wins."  # Inzet kwijt
+    return 0, "Push! (Tie)"  # Bet terug
+
+def ai_action(game, strategy_table, deviations):
+    """STAND or HIT for game.player_hand from a strategy table (plus index plays), or exact EVs if the table is None."""
+    if strategy_table is None:
+        return ev.engine_best_action(game)
+    hand = game.player_hand
+    upcard = game.get_dealer_upcard_value()
+    action = strategy_table.item(hand.total, int(hand.is_soft), upcard)
+    if deviations:
+        action = apply_deviation(deviations, action, hand.total, hand.is_soft, upcard, game.true_count())
+    return action
+
+
+class BlackjackEngine:
+    """Headless Blackjack rules: dealing, player/dealer turns and payouts.
+
+    The engine never renders, sleeps or prints, so it can be driven at full speed
+    by simulations. BlackjackEnv wraps it with the Pygame visualization.
+    """
+    def __init__(self, num_decks=DEFAULT_NUM_DECKS, strategy=AI_STRATEGY, seed=None,
+                 penetration=SHOE_PENETRATION, bet_spread=AI_BET_SPREAD, deviations=AI_DEVIATIONS, history=None):
+        self.num_decks = num_decks
+        self._init_player(strategy, bet_spread, deviations)
+        if seed is None and history is not None:
+            # A fresh 64-bit seed instead of 128-bit OS entropy, so the logged shoe_seed can rebuild the shoe
+            seed = int(np.random.SeedSequence().generate_state(1, np.uint64)[0])
+        self.rng = np.random.default_rng(seed) # Own RNG so seeded engines are reproducible and independent
+        self.shoe = Shoe(self.num_decks, penetration=penetration, rng=self.rng)
+        self.dealer_hand = Hand()
+        self.dealer_actions = [] # Dealer actions of the current round (STAND/HIT), for the hand history
+        self.history = history # Optional history.HandHistoryWriter; every resolved round is appended to it
+        self.game_state = "BETTING"
+        self.message = ""
+
+    def _init_player(self, strategy, bet_spread, deviations):
+        """Sets up the player: strategy, counting, hand and balance. BlackjackTable keeps these per seat."""
+        # Strategy may be a registered name or a compiled table (see strategies.py).
+        # STRAT_OPTIMAL has no fixed table: it is decided per hand from the shoe composition.
+        self.strategy_table = resolve_strategy(strategy)
+        self.strategy = strategy_name(strategy)
+        # Card counting (see counting.py): bet sizing and index plays on the Hi-Lo true count
+        self.bet_spread = get_bet_spread(bet_spread)
+        self.deviations = get_deviations(deviations)
+        self.player_hand = Hand()
+        self.player_actions = [] # Actions of the current round (STAND/HIT), for the hand history
+        self.balance = STARTING_BALANCE
+        self.current_bet = 0
+        self.last_payout = 0
+
+    def check_deck(self):
+        """Reshuffles the shoe once the cut card has been reached."""
+        if self.shoe.needs_shuffle:
+            self.shoe.shuffle()
+
+    def _hidden_hole_card(self):
+        """The dealer's hole card while the player cannot see it, else None."""
+        if self.game_state == "PLAYER_TURN" and len(self.dealer_hand) > 1:
+            return self.dealer_hand[1]
+        return None
+
+    def visible_running_count(self):
+        """Hi-Lo running count of the cards the player has seen (the hidden hole card excluded)."""
+        hole = self._hidden_hole_card()
+        return self.shoe.running_count - (HILO_BY_CODE[hole] if hole is not None else 0)
+
+    def true_count(self):
+        """Visible running count per unseen deck."""
+        if self._hidden_hole_card() is None:
+            return self.shoe.true_count
+        return self.visible_running_count() / max(len(self.shoe) + 1, 13) * 52
+
+    def choose_bet(self):
+        """Bet for the next round from the bet spread and the current true count."""
+        return self.bet_spread.bet(self.true_count(), self.balance)
+
+    def reset_round(self):
+        """Resets hands and prepares for a new round."""
+        self.player_hand = Hand()
+        self.dealer_hand = Hand()
+        self.player_actions = []
+        self.dealer_actions = []
+        self.message = ""
+        self.current_bet = 0
+        self.game_state = "BETTING"
+        self.check_deck()
+
+    def place_bet(self, amount=None):
+        """Places the player's bet for the round (default: the bet from choose_bet)."""
+        if self.game_state != "BETTING": return False
+        if amount is None:
+            amount = self.choose_bet()
+        if amount <= 0:
+            self.message = "Bet must be positive!"
+            return False
+        self.current_bet = amount
+        self.message = f"Bet placed: €{self.current_bet}"
+        self.game_state = "DEALING"
+        return True
+
+    def deal_card(self, to_player=True):
+        """Deals one card from the shoe to player or dealer. Returns the dealt card code."""
+        card = self.shoe.draw()
+        hand = self.player_hand if to_player else self.dealer_hand
+        hand.add(card)
+        return card
+
+    def deal_initial_cards(self):
+        """Deals the starting hands for a round."""
+        if self.game_state != "DEALING": return
+        for to_player in (True, False, True, False):
+            self.deal_card(to_player=to_player)
+        self.check_initial_blackjack()
+
+    def check_initial_blackjack(self):
+        """Resolves the round immediately if either side was dealt a Blackjack."""
+        if self.player_hand.is_blackjack or self.dealer_hand.is_blackjack:
+            self.resolve_round()
+        else:
+            self.game_state = "PLAYER_TURN"
+            self.message = "Player's Turn (Hit or Stand)"
+
+    def player_hit(self):
+        """Player chooses to take another card."""
+        if self.game_state != "PLAYER_TURN": return
+        self.player_actions.append(HIT)
+        self.deal_card(to_player=True)
+        player_score = self.player_hand.total
+        self.message = f"Player Hits. Score: {player_score}"
+        if player_score > 21:
+            self.message = f"Player Busts! Score: {player_score}"
+            self.resolve_round()
+        elif player_score == 21:
+            self.message = f"Player has 21! Dealer's turn."
+            self.game_state = "DEALER_TURN"
+
+    def player_stand(self):
+        """Player chooses to stand."""
+        if self.game_state != "PLAYER_TURN": return
+        self.player_actions.append(STAND)
+        player_score = self.player_hand.total
+        self.message = f"Player Stands. Score: {player_score}. Dealer's Turn."
+        self.game_state = "DEALER_TURN"
+
+    def dealer_should_hit(self):
+        """Returns True while the dealer must draw under the house rules."""
+        return self.dealer_hand.total < DEALER_STAND_THRESHOLD
+
+    def dealer_hit(self):
+        """Deals one card to the dealer and updates the message. Returns the new score."""
+        self.dealer_actions.append(HIT)
+        self.deal_card(to_player=False)
+        dealer_score = self.dealer_hand.total
+        if dealer_score > 21:
+            self.message = f"Dealer Busts! Score: {dealer_score}"
+        else:
+            self.message = f"Dealer has {dealer_score}"
+        return dealer_score
+
+    def dealer_play(self):
+        """Dealer plays according to house rules. Returns True if play occurred."""
+        if self.game_state != "DEALER_TURN": return False
+
+        played_turn = False
+        while self.dealer_should_hit():
+            played_turn = True
+            self.dealer_hit()
+
+        dealer_score = self.dealer_hand.total
+        if not played_turn and dealer_score <= 21:
+            self.message = f"Dealer Stands. Score: {dealer_score}"
+
+        self.resolve_round()
+        return True
+
+    def resolve_round(self):
+        """Determines the winner and updates balance. Returns the payout, or None if already resolved."""
+        if self.game_state == "ROUND_OVER": return None  # Avoid double resolving
+
+        if self.game_state == "DEALER_TURN" and not self.dealer_hand.is_bust:
+            self.dealer_actions.append(STAND)
+        self.game_state = "ROUND_OVER"
+        payout, result_message = settle_hand(self.player_hand, self.dealer_hand, self.current_bet)
+
+        # De inzet wordt bij place_bet niet van het saldo afgehaald, dus een push laat het saldo gelijk
+        self.balance += payout
+        self.last_payout = payout
+        self.message = result_message + f" | Balance: €{self.balance}"
+        if self.history is not None:
+            self.history.record(self)
+        return payout
+
+    def get_dealer_upcard_value(self):
+        """Gets the numeric value of the dealer's visible card."""
+        if not self.dealer_hand: return 0
+        points = card_points(self.dealer_hand[0])
+        return 11 if points == 1 else points # Treat Ace as 11 for strategy lookup
+
+    def player_ai_action(self):
+        """AI decides action for the player from its strategy table (plus any index plays), or from exact EVs for STRAT_OPTIMAL."""
+        if self.game_state != "PLAYER_TURN": return
+
+        if ai_action(self, self.strategy_table, self.deviations) == STAND:
+            self.player_stand()
+        else:
+            self.player_hit()
+
+    def play_round(self, bet_amount=None):
+        """Plays one complete AI round and resets for the next. Returns the payout, or None if no bet.
+
+        Without a bet_amount the bet comes from the engine's bet spread (see choose_bet).
+        """
+        if bet_amount is None:
+            bet_amount = self.choose_bet()
+        if not self.place_bet(bet_amount):
+            return None
+        self.deal_initial_cards()
+        while self.game_state == "PLAYER_TURN":
+            self.player_ai_action()
+        if self.game_state == "DEALER_TURN":
+            self.dealer_play()
+        payout = self.last_payout
+        self.reset_round()
+        return payout
@@ -0,0 +1,200 @@
+from functools import lru_cache
+import numpy as np
+from constants import DEFAULT_NUM_DECKS, DEALER_STAND_THRESHOLD, DEALER_CACHE_SIZE
+from hand import RANKS_PER_SUIT, card_points
+from strategies import STAND, HIT, TABLE_SHAPE, UPCARDS, validate_table
+
+# Compositions are tuples of remaining card counts per point value: index 0 = ace, 1 = two, ... 9 = ten-valued.
+# Dealer distributions are tuples of probabilities for final totals 17, 18, 19, 20, 21 and bust.
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, 22)
+_NO_OUTCOME = (0.0,) * len(DEALER_OUTCOMES)
+
+
+def composition_from_ranks(rank_counts):
+    """Folds per-rank counts (ace..king, e.g. Shoe.rank_counts) into a composition by point value."""
+    counts = [int(c) for c in rank_counts]
+    return tuple(counts[:9]) + (sum(counts[9:RANKS_PER_SUIT]),)
+
+def full_composition(num_decks=DEFAULT_NUM_DECKS):
+    """Composition of a fresh shoe."""
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+def remove_cards(composition, points):
+    """Returns the composition with the given card point values removed."""
+    counts = list(composition)
+    for p in points:
+        counts[p - 1] -= 1
+    return tuple(counts)
+
+
+def _best_total(hard_total, has_ace):
+    return hard_total + 10 if has_ace and hard_total <= 11 else hard_total
+
+def _peek_excluded(upcard):
+    """Index of the hole-card value that would give the dealer Blackjack, or None."""
+    return 9 if upcard == 1 else 0 if upcard == 10 else None
+
+@lru_cache(maxsize=None)
+def _dealer_paths(upcard):
+    """Every way the dealer can finish from an upcard, grouped by the multiset of cards drawn.
+
+    Returns arrays (draws, orderings, outcomes): draws[m] counts the cards of each value in
+    multiset m, orderings[m] is the number of draw orders that end exactly there (first card
+    never completing a Blackjack), and outcomes[m] indexes DEALER_OUTCOMES. These depend only
+    on the upcard, so the probabilities for any composition follow from falling factorials.
+    """
+    excluded = _peek_excluded(upcard)
+    finished = {}
+    level = {(0,) * 10: 1}
+    while level:
+        next_level = {}
+        for drawn, ways in level.items():
+            hard_total = upcard + sum((i + 1) * k for i, k in enumerate(drawn))
+            has_ace = upcard == 1 or drawn[0] > 0
+            for index in range(10):
+                if index == excluded and not any(drawn): continue
+                new_drawn = drawn[:index] + (drawn[index] + 1,) + drawn[index + 1:]
+                new_hard = hard_total + index + 1
+                total = _best_total(new_hard, has_ace or index == 0)
+                if new_hard > 21 or total >= DEALER_STAND_THRESHOLD:
+                    finished[new_drawn] = finished.get(new_drawn, 0) + ways
+                else:
+                    next_level[new_drawn] = next_level.get(new_drawn, 0) + ways
+        level = next_level
+
+    draws = np.array(list(finished), dtype=np.int64)
+    orderings = np.array(list(finished.values()), dtype=np.float64)
+    hard_totals = upcard + draws @ np.arange(1, 11)
+    best = np.where((upcard == 1) | (draws[:, 0] > 0), np.where(hard_totals <= 11, hard_totals + 10, hard_totals), hard_totals)
+    outcomes = np.where(hard_totals > 21, len(DEALER_OUTCOMES) - 1, best - DEALER_OUTCOMES[0])
+    return draws, orderings, outcomes
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def dealer_distribution(upcard, composition):
+    """Distribution of the dealer's final total given the upcard points (1-10), conditioned on no Blackjack.
+
+    The dealer peeks at the start of the round (see BlackjackEngine.check_initial_blackjack), so when
+    the player decides, the hole card cannot complete a Blackjack. composition excludes the upcard.
+    """
+    draws, orderings, outcomes = _dealer_paths(upcard)
+    counts = np.array(composition, dtype=np.float64)
+    remaining = counts.sum()
+    excluded = _peek_excluded(upcard)
+    allowed = remaining - (counts[excluded] if excluded is not None else 0)
+    if allowed <= 0:
+        return _NO_OUTCOME
+
+    # falling[i, k] = counts[i] * (counts[i] - 1) * ... (k factors): ways to draw k cards of value i
+    max_draws = draws.max()
+    steps = np.arange(max_draws, dtype=np.float64)
+    falling = np.ones((10, max_draws + 1))
+    falling[:, 1:] = np.cumprod(np.maximum(counts[:, None] - steps, 0), axis=1)
+    falling_total = np.ones(max_draws * 10 + 1)
+    falling_total[1:] = np.cumprod(np.maximum(remaining - np.arange(max_draws * 10), 0))
+
+    sizes = draws.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = orderings * falling[np.arange(10), draws].prod(axis=1) / falling_total[sizes]
+    p = np.nan_to_num(p) * (remaining / allowed)  # Condition on the hole card not giving Blackjack
+    return tuple(np.bincount(outcomes, weights=p, minlength=len(DEALER_OUTCOMES)).tolist())
+
+
+def stand_ev(player_total, upcard, composition):
+    """Expected value (in bets) of standing on player_total."""
+    if player_total > 21:
+        return -1.0
+    dist = dealer_distribution(upcard, composition)
+    ev = dist[-1]  # Dealer busts
+    for outcome, p in zip(DEALER_OUTCOMES[:-1], dist[:-1]):
+        if player_total > outcome: ev += p
+        elif player_total < outcome: ev -= p
+    return ev
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def _hand_ev(hard_total, has_ace, upcard, composition):
+    """Returns (stand EV, hit EV) for a hand with optimal play after any hit."""
+    total = _best_total(hard_total, has_ace)
+    ev_stand = stand_ev(total, upcard, composition)
+    remaining = sum(composition)
+    if remaining == 0:
+        return ev_stand, ev_stand
+
+    ev_hit = 0.0
+    for index, count in enumerate(composition):
+        if count == 0: continue
+        new_hard = hard_total + index + 1
+        if new_hard > 21:
+            ev = -1.0
+        else:
+            new_ace = has_ace or index == 0
+            new_comp = remove_cards(composition, (index + 1,))
+            if _best_total(new_hard, new_ace) == 21:
+                # Reaching 21 ends the player's turn (see BlackjackEngine.player_hit)
+                ev = stand_ev(21, upcard, new_comp)
+            else:
+                ev = max(_hand_ev(new_hard, new_ace, upcard, new_comp))
+        ev_hit += count / remaining * ev
+    return ev_stand, ev_hit
+
+def expected_values(player_points, upcard, composition):
+    """Exact (stand EV, hit EV) for a player hand against a dealer upcard.
+
+    player_points are the point values of the player's cards (ace = 1), upcard is the
+    dealer's upcard points, and composition holds the cards that are still unseen
+    (the dealer's hole card included, the player's cards and the upcard excluded).
+    """
+    hard_total = sum(player_points)
+    return _hand_ev(hard_total, 1 in player_points, upcard, tuple(composition))
+
+def best_action(player_points, upcard, composition):
+    """Returns STAND or HIT, whichever has the higher exact expected value."""
+    if sum(player_points) <= 11 and 1 not in player_points:
+        # A hard 11 or less cannot bust and only improves; the unseen card taken has the same
+        # distribution as the one the dealer would have drawn, so hitting is never worse.
+        return HIT
+    ev_stand, ev_hit = expected_values(player_points, upcard, composition)
+    return HIT if ev_hit > ev_stand else STAND
+
+def clear_caches():
+    """Drops all memoized dealer and player results."""
+    dealer_distribution.cache_clear()
+    _hand_ev.cache_clear()
+
+
+def _representative_hand(total, soft):
+    """A typical two-card hand (as point values) for a table state."""
+    if soft:
+        return (1, total - 11) if total > 12 else (1, 1)
+    if total >= 12:
+        return (10, total - 10)
+    return (total // 2, total - total // 2)
+
+def optimal_table(composition=None, num_decks=DEFAULT_NUM_DECKS):
+    """Builds a strategy table of EV-maximizing actions for a given composition (default: a fresh shoe).
+
+    Every (total, soft, upcard) state is evaluated with a representative two-card hand, so the
+    result is a total-dependent table that the engine and the batch simulator can play directly.
+    """
+    composition = full_composition(num_decks) if composition is None else tuple(composition)
+    table = np.full(TABLE_SHAPE, STAND, dtype=np.uint8)
+    for upcard in UPCARDS:
+        upcard_points = 1 if upcard == 11 else upcard
+        for soft, first in ((False, 4), (True, 12)):
+            for total in range(first, 21):
+                hand = _representative_hand(total, soft)
+                remaining = remove_cards(composition, hand + (upcard_points,))
+                if min(remaining) < 0: continue  # Hand cannot be dealt from this composition
+                table[total, int(soft), upcard] = best_action(hand, upcard_points, remaining)
+    return validate_table(table)
+
+def engine_composition(engine):
+    """Composition the player can see at the table: the shoe plus the dealer's hidden hole card."""
+    counts = list(engine.shoe.rank_counts)
+    if len(engine.dealer_hand) > 1:
+        counts[engine.dealer_hand[1] % RANKS_PER_SUIT] += 1
+    return composition_from_ranks(counts)
+
+def engine_best_action(engine):
+    """Composition-dependent best action for the engine's current player hand."""
+    points = tuple(card_points(code) for code in engine.player_hand)
+    return best_action(points, card_points(engine.dealer_hand[0]), engine_composition(engine))
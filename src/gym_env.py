@@ -0,0 +1,163 @@
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from constants import DEFAULT_NUM_DECKS, DEFAULT_BET
+from engine import BlackjackEngine
+from strategies import STAND, HIT
+from batch_sim import HILO_BY_POINTS, BatchShoe, best_totals, dealer_finish, settle
+
+# Observation: [player total, soft flag, dealer upcard value (ace = 11)] and optionally the
+# Hi-Lo true count, rounded and clipped to +-COUNT_RANGE and shifted to be non-negative.
+COUNT_RANGE = 10
+
+
+def _observation_space(include_count):
+    sizes = [32, 2, 12] + ([2 * COUNT_RANGE + 1] if include_count else [])
+    return spaces.MultiDiscrete(sizes)
+
+def _count_bucket(running_count, cards_remaining):
+    """Rounds the true count (running count per remaining deck) into the observation bucket."""
+    decks_remaining = np.maximum(cards_remaining, 1) / 52
+    true_count = np.rint(running_count / decks_remaining)
+    return np.clip(true_count, -COUNT_RANGE, COUNT_RANGE).astype(np.int64) + COUNT_RANGE
+
+
+class BlackjackGymEnv(gym.Env):
+    """gymnasium.Env for one hand of this project's Blackjack, played on a BlackjackEngine.
+
+    Actions are STAND (0) and HIT (1), rewards are the payout in bets (1.5 for Blackjack).
+    A hand dealt as Blackjack for either side is already decided; the first step then
+    ends the episode with that result whatever the action.
+    """
+    metadata = {"render_modes": []}
+
+    def __init__(self, num_decks=DEFAULT_NUM_DECKS, include_count=False):
+        self.num_decks = num_decks
+        self.include_count = include_count
+        self.observation_space = _observation_space(include_count)
+        self.action_space = spaces.Discrete(2)
+        self.engine = None
+
+    def _get_obs(self):
+        hand = self.engine.player_hand
+        obs = [hand.total, int(hand.is_soft), self.engine.get_dealer_upcard_value()]
+        if self.include_count:
+            obs.append(int(_count_bucket(self.engine.visible_running_count(), len(self.engine.shoe))))
+        return np.array(obs, dtype=np.int64)
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        if self.engine is None or seed is not None:
+            self.engine = BlackjackEngine(num_decks=self.num_decks, seed=self.np_random)
+        else:
+            self.engine.reset_round()
+        self.engine.place_bet(DEFAULT_BET)
+        self.engine.deal_initial_cards()
+        return self._get_obs(), {}
+
+    def step(self, action):
+        engine = self.engine
+        if engine.game_state == "PLAYER_TURN":
+            if action == HIT:
+                engine.player_hit()
+            else:
+                engine.player_stand()
+        if engine.game_state == "DEALER_TURN":
+            engine.dealer_play()
+
+        terminated = engine.game_state == "ROUND_OVER"
+        reward = engine.last_payout / engine.current_bet if terminated else 0.0
+        return self._get_obs(), reward, terminated, False, {}
+
+
+class BlackjackVectorEnv(VectorEnv):
+    """Natively batched version of BlackjackGymEnv: num_envs tables stepped with array operations.
+
+    Each table has its own shoe (see batch_sim.BatchShoe). Finished hands are dealt anew in
+    the same step (AutoresetMode.SAME_STEP); their last observation is in info["final_obs"].
+    """
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs, num_decks=DEFAULT_NUM_DECKS, include_count=False):
+        self.num_envs = num_envs
+        self.num_decks = num_decks
+        self.include_count = include_count
+        self.single_observation_space = _observation_space(include_count)
+        self.single_action_space = spaces.Discrete(2)
+        self.observation_space = gym.vector.utils.batch_space(self.single_observation_space, num_envs)
+        self.action_space = gym.vector.utils.batch_space(self.single_action_space, num_envs)
+        self.shoe = None
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.shoe = BatchShoe(self.num_envs, num_decks=self.num_decks, rng=self.np_random)
+        self.player_hard = np.zeros(self.num_envs, dtype=np.int64)
+        self.player_ace = np.zeros(self.num_envs, dtype=bool)
+        self.dealer_hard = np.zeros(self.num_envs, dtype=np.int64)
+        self.dealer_ace = np.zeros(self.num_envs, dtype=bool)
+        self.upcard = np.zeros(self.num_envs, dtype=np.int64)
+        self.hole = np.zeros(self.num_envs, dtype=np.int64)
+        self._deal(np.ones(self.num_envs, dtype=bool))
+        return self._get_obs(), {}
+
+    def _deal(self, lanes):
+        """Starts a new hand in the selected lanes, reshuffling shoes that reached the cut card."""
+        self.shoe.shuffle(lanes & (self.shoe.cursor > self.shoe.cut_card))
+        p1, d1, p2, d2 = (self.shoe.draw(lanes) for _ in range(4))
+        self.player_hard[lanes] = p1[lanes].astype(np.int64) + p2[lanes]
+        self.player_ace[lanes] = (p1[lanes] == 1) | (p2[lanes] == 1)
+        self.dealer_hard[lanes] = d1[lanes].astype(np.int64) + d2[lanes]
+        self.dealer_ace[lanes] = (d1[lanes] == 1) | (d2[lanes] == 1)
+        self.upcard[lanes] = np.where(d1[lanes] == 1, 11, d1[lanes])
+        self.hole[lanes] = d2[lanes]
+
+    def _get_obs(self):
+        player_total, player_soft = best_totals(self.player_hard, self.player_ace)
+        columns = [player_total, player_soft.astype(np.int64), self.upcard]
+        if self.include_count:
+            visible = self.shoe.running_count - HILO_BY_POINTS[self.hole]
+            columns.append(_count_bucket(visible, self.shoe.size - self.shoe.cursor))
+        return np.stack(columns, axis=1)
+
+    def blackjacks(self):
+        """(player, dealer) Blackjack masks of the current hands; such hands are decided whatever the action."""
+        player_total, _ = best_totals(self.player_hard, self.player_ace)
+        dealer_total, _ = best_totals(self.dealer_hard, self.dealer_ace)
+        player_bj = (player_total == 21) & (self.player_hard <= 11) # Two-card 21 is the only 21 before acting
+        dealer_bj = (dealer_total == 21) & (self.dealer_hard <= 11)
+        return player_bj, dealer_bj
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        player_bj, dealer_bj = self.blackjacks()
+        natural = player_bj | dealer_bj
+
+        hitting = ~natural & (actions == HIT)
+        card = self.shoe.draw(hitting)
+        self.player_hard += card
+        self.player_ace |= card == 1
+        player_total, _ = best_totals(self.player_hard, self.player_ace)
+
+        # The dealer plays for stands and for hits that reached 21; busts and naturals are settled as is
+        dealer_turn = ~natural & ((actions == STAND) | (player_total == 21))
+        dealer_total = dealer_finish(self.shoe, dealer_turn, self.dealer_hard, self.dealer_ace)
+        terminated = natural | dealer_turn | (player_total > 21)
+
+        net = settle(player_total, dealer_total, player_bj, dealer_bj, DEFAULT_BET)
+        rewards = np.where(terminated, net / DEFAULT_BET, 0.0)
+        truncations = np.zeros(self.num_envs, dtype=bool)
+
+        infos = {}
+        if terminated.any():
+            infos = {"final_obs": self._get_obs(), "_final_obs": terminated}
+            self._deal(terminated)
+        return self._get_obs(), rewards, terminated, truncations, infos
+
+
+# Registered so the envs can be created with gymnasium.make / gymnasium.make_vec
+gym.register(
+    id="ShoeBlackjack-v0",
+    entry_point=BlackjackGymEnv,
+    vector_entry_point=BlackjackVectorEnv,
+)
@@ -0,0 +1,83 @@
+from constants import SUITS, VALUES
+
+# Cards are encoded as small integers: code = suit_index * 13 + rank_index, where
+# rank_index follows VALUES (0 = ace ... 12 = king) and suit_index follows SUITS.
+RANKS_PER_SUIT = len(VALUES)
+NUM_CARD_CODES = len(SUITS) * RANKS_PER_SUIT
+
+# Blackjack points per rank index; aces count as 1 and are promoted to 11 by Hand when soft
+RANK_POINTS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+CODE_POINTS = tuple(RANK_POINTS[code % RANKS_PER_SUIT] for code in range(NUM_CARD_CODES))
+
+
+def encode_card(card_value, suit):
+    """Returns the integer code of a card given as strings, e.g. ('ace', 'spades')."""
+    return SUITS.index(suit) * RANKS_PER_SUIT + VALUES.index(card_value)
+
+def decode_card(code):
+    """Returns the (value, suit) strings of an integer card code."""
+    return VALUES[code % RANKS_PER_SUIT], SUITS[code // RANKS_PER_SUIT]
+
+def card_rank(code):
+    """Returns the rank index (0 = ace ... 12 = king) of a card code."""
+    return code % RANKS_PER_SUIT
+
+def card_points(code):
+    """Returns the Blackjack points of a card code, counting an ace as 1."""
+    return CODE_POINTS[code]
+
+def max_hand_cards(num_decks):
+    """Most cards one hand can hold without busting: the shoe's lowest cards, aces (as 1) first."""
+    total = cards = 0
+    for points in sorted(RANK_POINTS):
+        for _ in range(4 * max(1, num_decks)):
+            if total + points > 21:
+                return cards
+            total += points
+            cards += 1
+    return cards
+
+
+class Hand:
+    """A Blackjack hand of integer card codes with O(1) incremental evaluation.
+
+    The hard total, ace count and the derived total/soft/blackjack/bust flags are
+    updated as each card is added, so reading them never rescans the cards.
+    """
+    __slots__ = ("cards", "hard_total", "aces", "total", "is_soft", "is_blackjack", "is_bust")
+
+    def __init__(self, cards=()):
+        self.cards = []
+        self.hard_total = 0
+        self.aces = 0
+        self.total = 0
+        self.is_soft = False
+        self.is_blackjack = False
+        self.is_bust = False
+        for code in cards:
+            self.add(code)
+
+    def add(self, code):
+        """Adds one card code and updates the cached totals and flags."""
+        self.cards.append(code)
+        points = CODE_POINTS[code]
+        self.hard_total += points
+        if points == 1:
+            self.aces += 1
+        # At most one ace can count as 11 without busting
+        self.is_soft = self.aces > 0 and self.hard_total <= 11
+        self.total = self.hard_total + 10 if self.is_soft else self.hard_total
+        self.is_bust = self.hard_total > 21
+        self.is_blackjack = self.total == 21 and len(self.cards) == 2
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    def __repr__(self):
+        return f"Hand({[decode_card(code) for code in self.cards]}, total={self.total})"
@@ -0,0 +1,236 @@
+import json
+import os
+import struct
+import numpy as np
+from constants import DEFAULT_NUM_DECKS
+from hand import max_hand_cards
+from shoe import Shoe
+from strategies import HIT
+
+# Append-only binary hand history: one fixed-size record per round (see history_dtype), so a log of
+# billions of hands can be memory-mapped and analysed with NumPy without parsing anything.
+# Cards are stored as their uint8 codes (suit * 13 + rank, see hand.py); card and action slots
+# after the last one hold NO_ENTRY. Every hand gets max_hand_cards(num_decks) slots, enough for
+# the longest hand the shoe allows. The strategy names live in a JSON sidecar (path + ".json").
+NO_ENTRY = 255
+MAX_STRATEGIES = 0xFFFF # Highest strategy index a record can hold
+DEFAULT_CHUNK_RECORDS = 65_536 # Records buffered before they are written out
+
+
+def history_dtype(hand_slots):
+    """Record layout of a log with hand_slots card and action slots per hand."""
+    return np.dtype([
+        ("shoe_seed", "<u8"), # Shoe.seed of the engine: the shoe order follows from it, shoe_stream and shoe_number
+        ("shoe_stream", "<i4"), # Shoe.stream: which spawned child of that seed (-1: the seed itself)
+        ("shoe_number", "<u4"), # Shuffles of that shoe so far (1 = the first shoe)
+        ("shoe_position", "<u2"), # Cards dealt from the shoe before this round
+        ("strategy", "<u2"), # Index into the sidecar's strategy list
+        ("seat", "u1"), # 1-based seat of a BlackjackTable, 0 for a single-player engine
+        ("bet", "<i4"),
+        ("payout", "<i4"),
+        ("player_cards", "u1", (hand_slots,)),
+        ("dealer_cards", "u1", (hand_slots,)),
+        ("player_actions", "u1", (hand_slots,)), # STAND / HIT in order
+        ("dealer_actions", "u1", (hand_slots,)),
+    ])
+
+def _record_struct(hand_slots):
+    # The same layout for packing single records, which is several times faster than filling array rows
+    record = struct.Struct(f"<QiIHHBii{hand_slots}s{hand_slots}s{hand_slots}s{hand_slots}s")
+    assert record.size == history_dtype(hand_slots).itemsize
+    return record
+
+
+class HandHistoryWriter:
+    """Appends every resolved round of an engine to a binary hand-history file.
+
+    Pass it as BlackjackEngine(history=...) (or BlackjackEnv) and the engine calls record()
+    when a round is resolved. Records are buffered and written in chunks; use as a context
+    manager so the last chunk is flushed. An existing log is appended to.
+    """
+    def __init__(self, path, num_decks=DEFAULT_NUM_DECKS, chunk_records=DEFAULT_CHUNK_RECORDS):
+        self.path = path
+        self.strategies = {} # Strategy name -> index
+        self.num_decks = num_decks
+        if os.path.exists(path) and os.path.exists(path + ".json"):
+            meta = _read_meta(path)
+            if _meta_dtype(meta) != history_dtype(meta.get("hand_slots", 0)):
+                raise ValueError(f"{path} was written in another hand-history format")
+            self.strategies = {name: index for index, name in enumerate(meta["strategies"])}
+            self.num_decks = meta["num_decks"]
+        self.hand_slots = max_hand_cards(self.num_decks)
+        self.dtype = history_dtype(self.hand_slots)
+        self._record = _record_struct(self.hand_slots)
+        self._padding = bytes([NO_ENTRY]) * self.hand_slots
+        self.chunk_records = chunk_records
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._file = open(path, "ab")
+
+    def record(self, engine):
+        """Appends the round the engine has just resolved."""
+        dealt = len(engine.player_hand) + len(engine.dealer_hand)
+        self.record_hand(engine, engine.player_hand, engine.player_actions, engine.strategy,
+                         engine.current_bet, engine.last_payout, dealt)
+
+    def record_hand(self, engine, hand, actions, strategy, bet, payout, dealt, seat=0):
+        """Appends one player hand of the round the engine has just resolved (e.g. one seat of a table).
+
+        dealt is the number of cards dealt in the whole round; seat is the 1-based seat number, 0 for an engine.
+        """
+        shoe = engine.shoe
+        self._buffer += self._record.pack(
+            shoe.seed, shoe.stream, shoe.shuffles, max(shoe.cursor - dealt, 0),
+            self._strategy_index(strategy), seat, bet, payout,
+            self._slots(hand.cards), self._slots(engine.dealer_hand.cards),
+            self._slots(actions), self._slots(engine.dealer_actions),
+        )
+        self._buffered += 1
+        if self._buffered >= self.chunk_records:
+            self.flush()
+
+    def _strategy_index(self, name):
+        index = self.strategies.setdefault(name, len(self.strategies))
+        if index > MAX_STRATEGIES:
+            del self.strategies[name]
+            raise ValueError(f"A hand history holds at most {MAX_STRATEGIES + 1} strategies")
+        return index
+
+    def _slots(self, values):
+        if len(values) > self.hand_slots: # Only from an engine with more decks than the log was made for
+            raise ValueError(f"Hand of {len(values)} cards or actions does not fit a {self.num_decks}-deck log")
+        return bytes(values) + self._padding[len(values):]
+
+    def flush(self):
+        """Writes the buffered records and the sidecar."""
+        self._file.write(self._buffer)
+        self._buffer = bytearray()
+        self._buffered = 0
+        self._file.flush()
+        with open(self.path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"dtype": self.dtype.descr, "strategies": list(self.strategies), "num_decks": self.num_decks,
+                       "hand_slots": self.hand_slots}, f)
+
+    def close(self):
+        if self._file.closed: return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_meta(path):
+    with open(path + ".json", encoding="utf-8") as f:
+        return json.load(f)
+
+def _meta_dtype(meta):
+    # JSON turns the (name, type, shape) tuples of dtype.descr into lists
+    return np.dtype([tuple(tuple(part) if isinstance(part, list) else part for part in field) for field in meta["dtype"]])
+
+
+def read_hand_history(path):
+    """Memory-maps a hand-history file. Returns (records, strategy names)."""
+    meta = _read_meta(path)
+    dtype = _meta_dtype(meta)
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype), meta["strategies"] # np.memmap cannot map an empty file
+    return np.memmap(path, dtype=dtype, mode="r"), meta["strategies"]
+
+def card_counts(records):
+    """Number of player and dealer cards per record."""
+    return (records["player_cards"] != NO_ENTRY).sum(axis=1), (records["dealer_cards"] != NO_ENTRY).sum(axis=1)
+
+def deal_order(record):
+    """The cards of one record in the order they were dealt: player, dealer, player, dealer, player hits, dealer hits."""
+    player = [int(code) for code in record["player_cards"] if code != NO_ENTRY]
+    dealer = [int(code) for code in record["dealer_cards"] if code != NO_ENTRY]
+    return player[:1] + dealer[:1] + player[1:2] + dealer[1:2] + player[2:] + dealer[2:]
+
+
+class ReplayShoe(Shoe):
+    """A shoe that deals the logged cards of one round at a time instead of shuffled decks."""
+    def __init__(self, num_decks=DEFAULT_NUM_DECKS):
+        super().__init__(num_decks, penetration=1.0) # Never due a reshuffle
+
+    def load(self, cards):
+        """Puts the cards of the next round on top of the shoe."""
+        self.cards[:len(cards)] = cards
+        self.cursor = 0
+        self.rank_counts[:] = [4 * self.num_decks] * len(self.rank_counts)
+        self.running_count = 0
+
+
+class HandReplayer:
+    """Plays the rounds of a hand history back through an engine, e.g. a BlackjackEnv in the GUI.
+
+    The engine's shoe is replaced by a ReplayShoe holding each round's logged cards, the bet
+    is the logged bet, and player_action() takes the logged player actions instead of the AI.
+    The dealer plays by the engine's rules; mismatches with the log count as divergences.
+    """
+    def __init__(self, path, engine, start=0):
+        self.records, self.strategies = read_hand_history(path)
+        self.engine = engine
+        engine.shoe = ReplayShoe(engine.num_decks)
+        self.index = start - 1 # Record of the round being replayed
+        self.divergences = 0
+        self._checked = self.index # Last record compared by finish_round
+
+    @property
+    def record(self):
+        return self.records[self.index]
+
+    @property
+    def done(self):
+        """True once the last logged round has been started."""
+        return self.index + 1 >= len(self.records)
+
+    def start_round(self):
+        """Resets the engine and places the next logged round's bet. Returns False at the end of the log."""
+        if self.done:
+            return False
+        self.index += 1
+        self.engine.reset_round()
+        self.engine.shoe.load(deal_order(self.record))
+        return self.engine.place_bet(int(self.record["bet"]))
+
+    def player_action(self):
+        """Takes the next logged player action (a stand if the log has none left)."""
+        engine = self.engine
+        if engine.game_state != "PLAYER_TURN": return
+        actions = self.record["player_actions"]
+        step = len(engine.player_actions)
+        if step < actions.size and actions[step] == HIT:
+            engine.player_hit()
+        else:
+            engine.player_stand()
+
+    def finish_round(self):
+        """Checks the resolved round against the log once. Returns True if the payout and dealer actions match."""
+        engine = self.engine
+        if self._checked == self.index or engine.game_state != "ROUND_OVER":
+            return True
+        self._checked = self.index
+        logged = [int(action) for action in self.record["dealer_actions"] if action != NO_ENTRY]
+        # At a table the dealer also plays for the other seats, after a hand that alone would not need it
+        dealer_matches = engine.dealer_actions == logged or (self.record["seat"] > 0 and not engine.dealer_actions)
+        matches = engine.last_payout == int(self.record["payout"]) and dealer_matches
+        if not matches:
+            self.divergences += 1
+        return matches
+
+    def play_round(self):
+        """Replays the next round headless. Returns its payout, or None at the end of the log."""
+        engine = self.engine
+        if not self.start_round():
+            return None
+        engine.deal_initial_cards()
+        while engine.game_state == "PLAYER_TURN":
+            self.player_action()
+        if engine.game_state == "DEALER_TURN":
+            engine.dealer_play()
+        self.finish_round()
+        return engine.last_payout
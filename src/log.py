@@ -0,0 +1,72 @@
+import logging
+import logging.handlers
+from collections import deque
+from constants import LOG_LEVEL, LOG_FILE, LOG_RING_BUFFER, LOG_FILE_BUFFER
+
+# Leveled logging for the game and simulations, on top of the standard logging module.
+# Modules log through get_logger(__name__) with %-style arguments, so a disabled level costs one
+# level check and no string formatting; build expensive messages only under isEnabledFor.
+# Nothing is shown until configure_logging() is called (the GUI and the CLI scripts do),
+# apart from Python's default fallback for warnings and errors.
+ROOT_LOGGER = "blackjack"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+CONSOLE_FORMAT = "%(message)s"
+
+
+def get_logger(name):
+    """Logger for a module, below the common "blackjack" logger."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last `capacity` log records in memory, e.g. for an in-game log panel or a crash dump.
+
+    Records are stored as they are and only formatted when read.
+    """
+    def __init__(self, capacity=LOG_RING_BUFFER):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def lines(self, last=None, formatted=True):
+        """The buffered messages, oldest first (only the last `last` if given)."""
+        records = list(self.records)[-last:] if last else list(self.records)
+        return [self.format(record) if formatted else record.getMessage() for record in records]
+
+    def dump(self, path):
+        """Writes the buffered records to a file, e.g. after a crash."""
+        with open(path, "w", encoding="utf-8") as f:
+            for line in self.lines():
+                f.write(line + "\n")
+
+
+def configure_logging(level=LOG_LEVEL, log_file=LOG_FILE, ring_buffer=LOG_RING_BUFFER, console=True):
+    """Sets up the "blackjack" loggers. Returns the RingBufferHandler, or None without a ring buffer.
+
+    level is a name such as "DEBUG" or "WARNING". The log file is written in bulk: records
+    collect in a MemoryHandler and reach the file every LOG_FILE_BUFFER records, at once
+    on errors, and at exit.
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level)
+    logger.propagate = False
+    for handler in list(logger.handlers): # Configuring again replaces the previous setup
+        logger.removeHandler(handler)
+        handler.close()
+
+    if console:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        logger.addHandler(handler)
+    if log_file:
+        target = logging.FileHandler(log_file, encoding="utf-8", delay=True)
+        target.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(logging.handlers.MemoryHandler(LOG_FILE_BUFFER, flushLevel=logging.ERROR, target=target))
+    ring = None
+    if ring_buffer:
+        ring = RingBufferHandler(ring_buffer)
+        logger.addHandler(ring)
+    return ring
@@ -1,10 +1,22 @@
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT, DEFAULT_BET
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, AI_THINK_DELAY_MS, ROUND_RESET_DELAY_MS, NUM_SEATS,
+    HAND_HISTORY_PATH, REPLAY_HISTORY_PATH, SHOW_PERF_OVERLAY, CRASH_LOG_PATH
+)
 from blackjack_env import BlackjackEnv
+from table_env import BlackjackTableEnv
 from utils import load_card_images
+from renderer import HIT_BUTTON_RECT, STAND_BUTTON_RECT, BET_BUTTON_RECT, PerformanceOverlay, LogOverlay, TurboOverlay
+from scheduler import Timeline
+from history import HandHistoryWriter, HandReplayer
+from turbo import TurboRunner
+from profiler import Profiler, ENGINE_PHASES, VIEW_PHASES, RENDERER_PHASES, DISPLAY_PHASES, FRAME_PHASE, WAIT_PHASE
+from log import get_logger, configure_logging
 
-def game_loop():
-    """Main game loop for the Pygame Blackjack game."""
+logger = get_logger(__name__)
+
+def game_loop(log_buffer=None):
+    """Main game loop for the Pygame Blackjack game. log_buffer (a log.RingBufferHandler) feeds the log panel."""
     pygame.init()
     pygame.font.init()
 
@@ -18,24 +30,73 @@ def game_loop():
         if deck_image is None or not card_images:
              raise ValueError("Asset loading failed.") # Raise error if loading returns None/empty
     except Exception as e: # Catch Pygame errors or other issues during load
-        print(f"\nFATAL ERROR: Failed to load essential game assets: {e}")
-        print("Please ensure Pygame is installed correctly and asset paths are correct.")
-        print("Check 'constants.py' for BASE_DIR, DATA_FOLDER, CARDS_FOLDER.")
+        logger.critical("FATAL ERROR: Failed to load essential game assets: %s\n"
+                        "Please ensure Pygame is installed correctly and asset paths are correct.\n"
+                        "Check 'constants.py' for BASE_DIR, DATA_FOLDER, CARDS_FOLDER.", e)
         pygame.quit() # Clean up pygame
         return 
 
     # --- Create Game Environment ---
     # Pass the loaded assets to the constructor
-    game = BlackjackEnv(deck_image=deck_image, card_images=card_images, num_decks=3)
+    history = None
+    replayer = None
+    if HAND_HISTORY_PATH and not REPLAY_HISTORY_PATH:
+        history = HandHistoryWriter(HAND_HISTORY_PATH, num_decks=3)
+    if NUM_SEATS > 1:
+        game = BlackjackTableEnv(deck_image=deck_image, card_images=card_images, seats=NUM_SEATS, num_decks=3,
+                                 history=history)
+    else:
+        game = BlackjackEnv(deck_image=deck_image, card_images=card_images, num_decks=3, history=history)
+        if REPLAY_HISTORY_PATH:
+            replayer = HandReplayer(REPLAY_HISTORY_PATH, game)
+    timeline = Timeline() # Pending deal/dealer/AI steps, advanced every frame
     running = True
     player_is_ai = False # Set to False for manual play
+    if NUM_SEATS > 1 or replayer:
+        player_is_ai = True # Table seats are always played by their AI, replays by the log
+
+    def next_round():
+        timeline.clear() # Drop a pending automatic reset when the player starts early
+        if replayer:
+            replayer.finish_round() # Counts a divergence if the hand played out differently than logged
+            if replayer.start_round():
+                game.message = f"Replaying hand {replayer.index + 1} of {len(replayer.records)}"
+                game.start_dealing(timeline)
+            else:
+                game.message = f"Replay finished ({replayer.divergences} divergent hands). Press Q to quit"
+            return
+        game.reset_round()
+        game.message = f"Click BET or press B (Bet: €{game.choose_bet()})"
 
     # Initial state setup
     game.reset_round()
     # Set initial message for betting state
-    if game.game_state == "BETTING":
-         game.message = f"Click BET or press B to start round (Bet: €{DEFAULT_BET})"
-
+    if replayer:
+        next_round()
+    elif game.game_state == "BETTING":
+         game.message = f"Click BET or press B to start round (Bet: €{game.choose_bet()})"
+
+    # --- Profiling: P toggles it; the timing hooks are only in place while it is on ---
+    profiler = Profiler()
+    profiler.instrument(game, {**ENGINE_PHASES, **VIEW_PHASES})
+    profiler.instrument(game.get_renderer(screen), RENDERER_PHASES)
+    profiler.instrument(pygame.display, DISPLAY_PHASES)
+    overlay = PerformanceOverlay(profiler, clock)
+    if SHOW_PERF_OVERLAY:
+        profiler.enable()
+    log_panel = LogOverlay(log_buffer) if log_buffer else None
+    show_log = False
+
+    # --- Turbo mode: T plays rounds at full speed with the AI and shows only a live panel ---
+    turbo = TurboRunner(game)
+    turbo_panel = TurboOverlay(turbo)
+
+    def stop_turbo(reason=None):
+        turbo.stop()
+        next_round()
+        if reason:
+            game.message = reason
+        game.renderer.invalidate() # Repaint the table over the panel
 
     while running:
         # --- Event Handling ---
@@ -43,38 +104,50 @@ def game_loop():
         for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_p: # Performance overlay
+                 if not profiler.toggle():
+                      game.renderer.invalidate() # Repaint the area the overlay covered
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_l and log_panel: # Log panel
+                 show_log = not show_log
+                 if not show_log:
+                      game.renderer.invalidate()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_t and not replayer: # Turbo mode
+                 if turbo.running:
+                      stop_turbo()
+                 else:
+                      timeline.clear() # Drop the pending steps of the animated round
+                      turbo.start()
+                      turbo_panel.surface = None # Fresh numbers right away
+                 continue
+            if turbo.running:
+                 continue # No betting or playing by hand while turbo mode plays
             if event.type == pygame.KEYDOWN:
                  if game.game_state == "BETTING":
                      if event.key == pygame.K_b: # Place bet
-                         if game.place_bet(DEFAULT_BET):
-                              # Bet placed, schedule dealing (using timer is smoother than direct call)
-                              pygame.time.set_timer(pygame.USEREVENT + 1, 200, 1) # Deal timer (short delay)
+                         if game.place_bet():
+                              game.start_dealing(timeline) # Cards follow on the timeline
                  elif game.game_state == "PLAYER_TURN" and not player_is_ai:
                      if event.key == pygame.K_h: # Hit
                          game.player_hit()
                      elif event.key == pygame.K_s: # Stand
                          game.player_stand()
-                 elif game.game_state == "ROUND_OVER" and game.balance <= 0:
-                     if event.key == pygame.K_q: # Quit on game over
+                 elif game.game_state == "ROUND_OVER" and (game.balance <= 0 or replayer):
+                     if event.key == pygame.K_q: # Quit on game over or after a replay
                           running = False
                  elif game.game_state == "ROUND_OVER":
                       # Allow pressing 'B' to start next round early
                       if event.key == pygame.K_b:
                            if game.balance > 0:
-                                game.reset_round()
-                                game.message = f"Click BET or press B (Bet: €{DEFAULT_BET})"
+                                next_round()
 
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1: # Left click
                  mouse_pos = event.pos
-                 # Define button rects here or get from constants/env if preferred
-                 hit_rect = pygame.Rect(SCREEN_WIDTH - 160, SCREEN_HEIGHT - 110, 150, 40)
-                 stand_rect = pygame.Rect(SCREEN_WIDTH - 160, SCREEN_HEIGHT - 60, 150, 40)
-                 bet_rect = pygame.Rect(SCREEN_WIDTH // 2 - 75, SCREEN_HEIGHT // 2 - 20, 150, 40)
+                 hit_rect, stand_rect, bet_rect = HIT_BUTTON_RECT, STAND_BUTTON_RECT, BET_BUTTON_RECT
 
                  if game.game_state == "BETTING" and bet_rect.collidepoint(mouse_pos):
-                      if game.place_bet(DEFAULT_BET):
-                           pygame.time.set_timer(pygame.USEREVENT + 1, 200, 1) # Deal timer
+                      if game.place_bet():
+                           game.start_dealing(timeline)
                  elif game.game_state == "PLAYER_TURN" and not player_is_ai:
                       if hit_rect.collidepoint(mouse_pos):
                            game.player_hit()
@@ -82,46 +155,68 @@ def game_loop():
                            game.player_stand()
                  elif game.game_state == "ROUND_OVER" and bet_rect.collidepoint(mouse_pos): # Allow clicking bet button again
                       if game.balance > 0:
-                           game.reset_round()
-                           game.message = f"Click BET or press B (Bet: €{DEFAULT_BET})"
-
-
-            if event.type == pygame.USEREVENT + 1: # Timer for dealing
-                 game.deal_initial_cards()
-                 pygame.time.set_timer(pygame.USEREVENT + 1, 0) # Stop timer
+                           next_round()
 
         # --- Game Logic / State Updates ---
-        # Check if all cards finished animating before processing next turn logic
-        all_cards_stopped = not any(c.is_moving for c in game.player_cards + game.dealer_cards)
-        # print(f"DEBUG: Loop Start - State: {game.game_state}, AI: {player_is_ai}, Cards Moving: {not all_cards_stopped}")
-        if all_cards_stopped:
-             if game.game_state == "PLAYER_TURN" and player_is_ai:
-                 pygame.time.wait(400) # AI thinking pause
-                 game.player_ai_action()
-
-             elif game.game_state == "DEALER_TURN":
-                 # Dealer logic might involve pauses, so pass screen for updates
-                 game.dealer_play(screen)
-
-             elif game.game_state == "ROUND_OVER":
-                 current_time = pygame.time.get_ticks()
-                 # Automatically reset after a delay IF balance is positive
-                 if game.balance > 0 and current_time - game.round_over_timer > 2500: # Wait 2.5 seconds
-                      game.reset_round()
-                      game.message = f"Click BET or press B (Bet: €{DEFAULT_BET})"
-                 elif game.balance <= 0:
-                      game.message = "Game Over - Out of Balance! (Press Q to quit)"
+        if turbo.running:
+            # As many rounds as fit in the frame budget; the table is not animated or drawn meanwhile
+            if not turbo.run():
+                stop_turbo(f"Turbo stopped: out of balance after {turbo.stats.rounds:,} rounds")
+        else:
+            timeline.update(pygame.time.get_ticks()) # Runs the scheduled steps that are due
+            # Check if all cards finished animating before processing next turn logic
+            all_cards_stopped = not game.cards_moving
+            # print(f"DEBUG: Loop Start - State: {game.game_state}, AI: {player_is_ai}, Cards Moving: {not all_cards_stopped}")
+            if all_cards_stopped and not timeline.busy:
+                 if game.game_state == "PLAYER_TURN" and player_is_ai:
+                     player_action = replayer.player_action if replayer else game.player_ai_action
+                     timeline.schedule(AI_THINK_DELAY_MS, player_action) # AI thinking pause
+
+                 elif game.game_state == "DEALER_TURN":
+                     game.start_dealer_turn(timeline)
+
+                 elif game.game_state == "ROUND_OVER":
+                     # Automatically reset after a delay IF balance is positive
+                     if replayer and replayer.done:
+                          next_round() # Checks the last hand and shows the end-of-replay message
+                     elif game.balance > 0 or replayer:
+                          timeline.schedule(ROUND_RESET_DELAY_MS, next_round)
+                     else:
+                          game.message = "Game Over - Out of Balance! (Press Q to quit)"
 
 
         # --- Drawing ---
-        game.render(screen) # Render the current state
-        pygame.display.flip() # Update the full display
+        dirty_rects = game.render(screen) # Only the parts of the screen that changed; no cards in turbo mode
+        if turbo.running:
+            dirty_rects.append(turbo_panel.draw(screen, pygame.time.get_ticks()))
+        if profiler.enabled:
+            dirty_rects.append(overlay.draw(screen, pygame.time.get_ticks()))
+        if show_log:
+            dirty_rects.append(log_panel.draw(screen, pygame.time.get_ticks()))
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
 
         # --- Frame Rate Control ---
-        clock.tick(60) # Limit FPS
-
+        frame_ms = clock.tick(60) # Limit FPS
+        if profiler.enabled:
+            profiler.record(FRAME_PHASE, frame_ms * 1_000_000)
+            profiler.record(WAIT_PHASE, (frame_ms - clock.get_rawtime()) * 1_000_000)
+
+    if history:
+        history.close()
+    if profiler.enabled:
+        logger.info("\n".join(profiler.report()))
+        profiler.disable()
     pygame.quit()
-    print("Game exited.")
+    logger.info("Game exited.")
 
 if __name__ == "__main__":
-    game_loop()
\ No newline at end of file
+    log_buffer = configure_logging()
+    try:
+        game_loop(log_buffer)
+    except Exception:
+        logger.exception("Game crashed")
+        if log_buffer:
+            log_buffer.dump(CRASH_LOG_PATH)
+            logger.critical("Recent log written to %s", CRASH_LOG_PATH)
+        raise
\ No newline at end of file
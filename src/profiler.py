@@ -0,0 +1,173 @@
+import math
+import time
+from functools import wraps
+
+# Per-phase timing. A Profiler wraps the methods it is told about in timing wrappers only while
+# it is enabled; disabled, the original methods are back in place, so the hooks cost nothing.
+#   profiler = Profiler()
+#   profiler.instrument(engine, ENGINE_PHASES)
+#   profiler.enable(); ...; profiler.stats()
+# Phase times are inclusive: deal_initial_cards also counts the resolve_round it may call.
+ENGINE_PHASES = {
+    "deal_initial_cards": "engine.deal_initial_cards",
+    "player_ai_action": "engine.player_ai_action",
+    "dealer_play": "engine.dealer_play",
+    "resolve_round": "engine.resolve_round",
+    # The GUI deals and plays the dealer step by step on the timeline instead
+    "deal_card": "engine.deal_card",
+    "dealer_hit": "engine.dealer_hit",
+}
+VIEW_PHASES = {
+    "animate_cards": "anim.update", # Advances the card tweens
+    "scene_builder": "render.scene", # Builds the whole scene, including render.text
+}
+RENDERER_PHASES = {
+    "draw": "render.draw", # The dirty-rect repaint: render.background and render.blits
+    "restore_background": "render.background",
+    "blit_scene": "render.blits", # Cards, text and buttons of the dirty areas
+    "text": "render.text", # Text surfaces, rendered on a TextCache miss
+}
+DISPLAY_PHASES = {"update": "render.flip"} # pygame.display
+FRAME_PHASE = "frame"
+WAIT_PHASE = "frame.wait" # Time clock.tick sleeps to hold the frame rate
+
+BUCKETS_PER_OCTAVE = 4
+HISTOGRAM_BUCKETS = 32 * BUCKETS_PER_OCTAVE # Up to 2**32 ns, about 4 s
+
+
+class PhaseStats:
+    """Count, total, maximum and a log-spaced histogram of one phase's durations in nanoseconds.
+
+    Each histogram bucket spans a factor 2**(1/BUCKETS_PER_OCTAVE), so percentiles are
+    upper bounds at most about 19% above the true value.
+    """
+    __slots__ = ("count", "total_ns", "max_ns", "histogram")
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        bucket = int(math.log2(ns) * BUCKETS_PER_OCTAVE) if ns > 1 else 0
+        self.histogram[min(bucket, HISTOGRAM_BUCKETS - 1)] += 1
+
+    def percentile(self, q):
+        """Upper bound of the q-th percentile (0..100) in nanoseconds."""
+        if not self.count: return 0.0
+        target = self.count * q / 100
+        seen = 0
+        for bucket, n in enumerate(self.histogram):
+            seen += n
+            if seen >= target:
+                return min(2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE), self.max_ns)
+        return float(self.max_ns)
+
+    def summary(self):
+        """The statistics as a plain dict, times in microseconds."""
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "p50_us": self.percentile(50) / 1e3,
+            "p95_us": self.percentile(95) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+        }
+
+
+class Profiler:
+    """Collects PhaseStats for instrumented methods and frames; switched on and off at runtime."""
+    def __init__(self):
+        self.enabled = False
+        self.phases = {}
+        self._targets = [] # (object, attribute, phase name)
+        self._originals = [] # (object, attribute, original, was set on the object itself)
+
+    def instrument(self, obj, phases):
+        """Registers methods of obj ({attribute: phase name}) to be timed while the profiler is enabled."""
+        for attribute, phase in phases.items():
+            self._targets.append((obj, attribute, phase))
+            if self.enabled:
+                self._patch(obj, attribute, phase)
+
+    def _patch(self, obj, attribute, phase):
+        original = getattr(obj, attribute)
+        own = attribute in getattr(obj, "__dict__", {})
+        self._originals.append((obj, attribute, original, own))
+        setattr(obj, attribute, self.wrap(original, phase))
+
+    def wrap(self, function, phase):
+        """Returns function wrapped to add its duration to phase."""
+        stats = self.phase(phase)
+        clock = time.perf_counter_ns
+        @wraps(function)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.add(clock() - start)
+        return timed
+
+    def enable(self):
+        """Puts the timing wrappers in place."""
+        if self.enabled: return
+        self.enabled = True
+        for obj, attribute, phase in self._targets:
+            self._patch(obj, attribute, phase)
+
+    def disable(self):
+        """Restores the original methods; the collected statistics are kept."""
+        if not self.enabled: return
+        self.enabled = False
+        for obj, attribute, original, own in reversed(self._originals):
+            if own:
+                setattr(obj, attribute, original)
+            else:
+                delattr(obj, attribute)
+        self._originals = []
+
+    def toggle(self):
+        """Switches the profiler on or off. Returns whether it is now enabled."""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def phase(self, name):
+        """The PhaseStats of a phase, created on first use."""
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        return stats
+
+    def record(self, name, ns):
+        """Adds a duration measured elsewhere (e.g. the frame time from pygame's clock)."""
+        self.phase(name).add(ns)
+
+    def reset(self):
+        """Clears the statistics of every phase."""
+        for stats in self.phases.values():
+            stats.clear()
+
+    def stats(self):
+        """{phase: PhaseStats.summary()} for every phase that has been recorded."""
+        return {name: stats.summary() for name, stats in self.phases.items() if stats.count}
+
+    def report(self):
+        """The statistics as text lines, the most expensive phase first."""
+        lines = []
+        for name, s in sorted(self.stats().items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{name:28s} {s['count']:8d}x mean {s['mean_us']:9.1f} us  p95 {s['p95_us']:9.1f} us  "
+                         f"max {s['max_us']:9.1f} us  total {s['total_ms']:9.1f} ms")
+        return lines
@@ -0,0 +1,311 @@
+from collections import OrderedDict
+import numpy as np
+import pygame
+from constants import (
+    GREEN, WHITE, BLACK, FONT_SIZE, SMALL_FONT_SIZE, PLACEHOLDER_FONT_SIZE, PERF_OVERLAY_REFRESH_MS,
+    SCREEN_WIDTH, SCREEN_HEIGHT, CARD_WIDTH, CARD_HEIGHT, DECK_POS, PLAYER_CARD_START_POS, DEALER_CARD_START_POS, TABLE_SEAT_Y
+)
+from display import init_display, get_font
+from profiler import FRAME_PHASE
+
+# Button rectangles, also used by main.py for mouse hit-testing
+HIT_BUTTON_RECT = pygame.Rect(SCREEN_WIDTH - 160, SCREEN_HEIGHT - 110, 150, 40)
+STAND_BUTTON_RECT = pygame.Rect(SCREEN_WIDTH - 160, SCREEN_HEIGHT - 60, 150, 40)
+BET_BUTTON_RECT = pygame.Rect(SCREEN_WIDTH // 2 - 75, SCREEN_HEIGHT // 2 - 20, 150, 40)
+
+TEXT_CACHE_SIZE = 256 # Rendered strings kept; messages with changing amounts make this unbounded otherwise
+
+
+class TextCache:
+    """Keeps rendered text surfaces keyed by (font, text, color), evicting the least recently used."""
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        """Returns the surface for text, rendering it only the first time it is asked for."""
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        else:
+            self._surfaces.move_to_end(key)
+        return surface
+
+
+class Renderer:
+    """Draws scenes onto the screen, repainting only the rectangles that changed since the last frame.
+
+    A scene is a list of (surface, position) items in drawing order. The static table
+    (felt and deck) is rendered once as a background; draw() compares the new scene
+    with the previous one and returns the dirty rectangles for pygame.display.update.
+    """
+    def __init__(self, screen, deck_image):
+        init_display() # pygame and fonts are only set up once something is actually drawn
+        self.screen = screen
+        self.font = get_font(FONT_SIZE)
+        self.small_font = get_font(SMALL_FONT_SIZE)
+        self.text_cache = TextCache()
+
+        self.card_back = deck_image
+        if self.card_back is None:
+            self.card_back = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
+            self.card_back.fill((0, 0, 100)) # Simple placeholder back
+
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(GREEN)
+        if deck_image:
+            self.background.blit(deck_image, DECK_POS)
+
+        self.hit_button = self._button((0, 180, 0), "HIT (H)")
+        self.stand_button = self._button((180, 0, 0), "STAND (S)")
+        self.bet_button = self._button((0, 0, 180), "BET (B)")
+
+        self._last_scene = None
+
+    def _button(self, color, label):
+        """Pre-renders a button with its label."""
+        surface = pygame.Surface(HIT_BUTTON_RECT.size)
+        surface.fill(color)
+        surface.blit(self.font.render(label, True, WHITE), (10, 5))
+        return surface
+
+    def text(self, font, text, color):
+        """Cached text surface."""
+        return self.text_cache.render(font, text, color)
+
+    def invalidate(self):
+        """Forces a full repaint on the next draw, e.g. after something else drew on the screen."""
+        self._last_scene = None
+
+    def draw(self, scene):
+        """Draws the scene and returns the list of screen rectangles that changed."""
+        scene = [(surface, pygame.Rect(pos, surface.get_size())) for surface, pos in scene]
+        keys = [(surface, tuple(rect)) for surface, rect in scene]
+
+        if self._last_scene is None:
+            dirty = [self.screen.get_rect()]
+        elif keys == self._last_scene:
+            return []
+        else:
+            old, new = set(self._last_scene), set(keys)
+            screen_rect = self.screen.get_rect()
+            dirty = [pygame.Rect(rect).clip(screen_rect) for _, rect in old ^ new]
+
+        for area in dirty:
+            self.restore_background(area)
+            self.blit_scene(scene, area)
+
+        self._last_scene = keys
+        return dirty
+
+    def restore_background(self, area):
+        """Repaints the background over one screen area."""
+        self.screen.blit(self.background, area, area)
+
+    def blit_scene(self, scene, area):
+        """Blits the scene items that overlap one screen area, clipped to it."""
+        self.screen.set_clip(area)
+        self.screen.blits([item for item in scene if item[1].colliderect(area)], doreturn=False)
+        self.screen.set_clip(None)
+
+
+class TextOverlay:
+    """A box of text lines drawn over the game, e.g. the performance overlay or the log panel.
+
+    The text is re-rendered every refresh_ms only; in between the same surface is blitted.
+    It is drawn after Renderer.draw, on top of whatever the renderer repainted.
+    """
+    def __init__(self, refresh_ms=PERF_OVERLAY_REFRESH_MS, **anchor):
+        self.refresh_ms = refresh_ms
+        self.anchor = anchor or {"topleft": (10, 90)} # A pygame.Rect position keyword, e.g. bottomleft=(10, 500)
+        self.font = get_font(PLACEHOLDER_FONT_SIZE)
+        self.surface = None
+        self._refreshed_at = None
+
+    def lines(self):
+        """The overlay text."""
+        return []
+
+    def draw(self, screen, now_ms):
+        """Draws the overlay on top of the screen. Returns the rectangle it covers."""
+        if self.surface is None or now_ms - self._refreshed_at >= self.refresh_ms:
+            self._refreshed_at = now_ms
+            self.surface = self.render_surface()
+        return screen.blit(self.surface, self.surface.get_rect(**self.anchor))
+
+    def render_surface(self, min_width=0):
+        """Renders the current lines onto a new surface."""
+        texts = [self.font.render(line, True, WHITE) for line in self.lines() or [""]]
+        # Opaque, so blitting it again every frame over the last one leaves the same pixels
+        surface = pygame.Surface((max(min_width, max(t.get_width() for t in texts) + 12), 18 * len(texts) + 8))
+        surface.fill(BLACK)
+        for i, text in enumerate(texts):
+            surface.blit(text, (6, 4 + 18 * i))
+        return surface
+
+
+class PerformanceOverlay(TextOverlay):
+    """Profiler statistics: FPS, frame-time percentiles and each phase's cost per frame.
+
+    Refreshing only every refresh_ms keeps the overlay out of its own numbers.
+    """
+    def __init__(self, profiler, clock, refresh_ms=PERF_OVERLAY_REFRESH_MS):
+        super().__init__(refresh_ms, topleft=(10, 90))
+        self.profiler = profiler
+        self.clock = clock
+
+    def lines(self):
+        phases = self.profiler.phases
+        frame = phases.get(FRAME_PHASE)
+        frames = frame.count if frame and frame.count else 1
+        lines = [f"FPS {self.clock.get_fps():.1f}"]
+        if frame and frame.count:
+            p50, p95, p99 = (frame.percentile(q) / 1e6 for q in (50, 95, 99))
+            lines.append(f"frame ms  p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}  max {frame.max_ns / 1e6:.1f}")
+        costs = sorted(((stats.total_ns, name) for name, stats in phases.items() if name != FRAME_PHASE and stats.count), reverse=True)
+        for total_ns, name in costs:
+            lines.append(f"{name}: {total_ns / frames / 1e3:.0f} us/frame")
+        return lines
+
+
+class LogOverlay(TextOverlay):
+    """The most recent log messages from a log.RingBufferHandler."""
+    MAX_CHARS = 90
+
+    def __init__(self, ring, last=10, refresh_ms=PERF_OVERLAY_REFRESH_MS):
+        super().__init__(refresh_ms, bottomleft=(10, SCREEN_HEIGHT - 55))
+        self.ring = ring
+        self.last = last
+
+    def lines(self):
+        lines = [line for message in self.ring.lines(self.last, formatted=False) for line in message.splitlines()]
+        return [line[:self.MAX_CHARS] for line in lines[-self.last:]]
+
+
+class TurboOverlay(TextOverlay):
+    """Live numbers of a turbo.TurboRunner: rounds, rounds/second, EV, tallies and the balance curve."""
+    CHART_HEIGHT = 140
+
+    def __init__(self, runner, refresh_ms=PERF_OVERLAY_REFRESH_MS):
+        super().__init__(refresh_ms, topright=(SCREEN_WIDTH - 10, DECK_POS[1] + CARD_HEIGHT + 40)) # Below the deck
+        self.runner = runner
+        self.width = runner.curve.points.size + 12 # Fixed, so a narrower refresh never leaves old pixels behind
+
+    def lines(self):
+        runner, stats = self.runner, self.runner.stats
+        return [
+            "TURBO - press T for normal play",
+            f"Rounds {stats.rounds:,}  ({runner.rate:,.0f}/s)",
+            f"EV {100 * runner.ev:+.2f}% of wagered  (€{stats.mean:+.2f}/round, sd {stats.std:.1f})",
+            f"W/L/P {stats.wins:,} / {stats.losses:,} / {stats.pushes:,}",
+            f"Balance €{self.runner.game.balance:,}  (max drawdown €{stats.max_drawdown:,})",
+        ]
+
+    def render_surface(self, min_width=0):
+        text = super().render_surface(self.width)
+        surface = pygame.Surface((text.get_width(), text.get_height() + self.CHART_HEIGHT + 8))
+        surface.fill(BLACK)
+        surface.blit(text, (0, 0))
+
+        chart = pygame.Rect(6, text.get_height(), surface.get_width() - 12, self.CHART_HEIGHT)
+        pygame.draw.rect(surface, (60, 60, 60), chart, 1)
+        curve = self.runner.curve.values()
+        if curve.size > 1:
+            low, high = float(curve.min()), float(curve.max())
+            span = (high - low) or 1.0
+            xs = chart.left + np.arange(curve.size) * (chart.width - 1) / (curve.size - 1)
+            ys = chart.bottom - 1 - (curve - low) / span * (chart.height - 1)
+            start = curve[0]
+            if low <= start <= high: # Starting balance as a reference line
+                y = int(chart.bottom - 1 - (start - low) / span * (chart.height - 1))
+                pygame.draw.line(surface, (90, 90, 90), (chart.left, y), (chart.right - 1, y))
+            pygame.draw.lines(surface, (0, 220, 0), False, np.column_stack((xs, ys)).tolist())
+        return surface
+
+
+def _card_item(card_obj):
+    """Scene item of a card sprite at its current (animated) position."""
+    x, y = card_obj.position
+    return card_obj.image, (int(x), int(y))
+
+def _dealer_items(renderer, env):
+    """Scene items for the deck count and the dealer's cards and score."""
+    scene = []
+    text = renderer.text
+    font, small_font = renderer.font, renderer.small_font
+
+    # Deck count next to the deck (the deck itself is part of the background)
+    deck_count = text(small_font, f"{len(env.shoe)}", WHITE)
+    deck_text_pos = (DECK_POS[0] + CARD_WIDTH + 5, DECK_POS[1] + 10) if env.deck_image else (DECK_POS[0] + 5, DECK_POS[1] + CARD_HEIGHT + 5)
+    scene.append((deck_count, deck_text_pos))
+
+    # Dealer cards & score
+    show_hole_card = env.game_state not in ["PLAYER_TURN", "DEALING", "BETTING"]
+    dealer_score_str = "?"
+    if env.dealer_hand: # Only calculate if dealer has cards
+        if show_hole_card:
+            dealer_score_str = str(env.dealer_hand.total)
+        else:
+            # Only show value of first card
+            dealer_score_str = str(env.get_dealer_upcard_value()) + "+?"
+
+    for i, card_obj in enumerate(env.dealer_cards):
+        if i == 1 and not show_hole_card:
+            scene.append((renderer.card_back, card_obj.end_pos))
+        else:
+            scene.append(_card_item(card_obj))
+    scene.append((text(font, f"Dealer: {dealer_score_str}", WHITE), (DEALER_CARD_START_POS[0], DEALER_CARD_START_POS[1] - 40)))
+    return scene
+
+def build_scene(renderer, env):
+    """Returns the scene items for a BlackjackEnv, in drawing order."""
+    scene = _dealer_items(renderer, env)
+    text = renderer.text
+    font = renderer.font
+
+    # Player cards & score
+    for card_obj in env.player_cards:
+        scene.append(_card_item(card_obj))
+    scene.append((text(font, f"Player: {env.player_hand.total}", WHITE), (PLAYER_CARD_START_POS[0], PLAYER_CARD_START_POS[1] - 40)))
+
+    # Balance, bet and message
+    scene.append((text(font, f"Balance: €{env.balance}", WHITE), (10, 10)))
+    scene.append((text(font, f"Bet: €{env.current_bet}", WHITE), (10, 50)))
+    message = text(font, env.message, BLACK)
+    scene.append((message, message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30)).topleft))
+
+    # Buttons (visibility depends on state)
+    if env.game_state == "PLAYER_TURN":
+        scene.append((renderer.hit_button, HIT_BUTTON_RECT.topleft))
+        scene.append((renderer.stand_button, STAND_BUTTON_RECT.topleft))
+    elif env.game_state == "BETTING" and not env.headless: # No betting by hand in turbo mode
+        scene.append((renderer.bet_button, BET_BUTTON_RECT.topleft))
+    return scene
+
+def build_table_scene(renderer, env):
+    """Returns the scene items for a table_env.BlackjackTableEnv, in drawing order."""
+    scene = _dealer_items(renderer, env)
+    text = renderer.text
+    font, small_font = renderer.font, renderer.small_font
+
+    # Seats: cards, then a label with score and balance above each slot (the active seat in black)
+    for seat, cards, positions in zip(env.seats, env.seat_cards, env.seat_positions):
+        for card_obj in cards:
+            scene.append(_card_item(card_obj))
+        color = BLACK if seat is env.active_seat else WHITE
+        score = f": {seat.hand.total}" if seat.hand else ""
+        scene.append((text(small_font, f"{env.seat_label(seat)}{score}", color), (positions[0][0], TABLE_SEAT_Y - 42)))
+        scene.append((text(small_font, f"€{seat.balance}", color), (positions[0][0], TABLE_SEAT_Y - 22)))
+
+    # Table balance and message (every seat is played by its AI, so there are no HIT/STAND buttons)
+    scene.append((text(font, f"Balance: €{env.balance}", WHITE), (10, 10)))
+    scene.append((text(font, f"Bets: €{sum(seat.current_bet for seat in env.seats)}", WHITE), (10, 50)))
+    message = text(font, env.message, BLACK)
+    scene.append((message, message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30)).topleft))
+    if env.game_state == "BETTING" and not env.headless:
+        scene.append((renderer.bet_button, BET_BUTTON_RECT.topleft))
+    return scene
@@ -0,0 +1,208 @@
+import csv
+import json
+import os
+import numpy as np
+
+# Per-round record columns, as written by test_ai. seat is 0 for single-player runs and
+# 1..TABLE_MAX_SEATS for the seats of a multi-seat table (see table.py).
+RESULT_COLUMNS = ("round", "chunk", "seat", "ai_strategy", "bet", "old_balance", "new_balance", "result")
+RESULT_CODES = {"loss": -1, "push": 0, "win": 1}
+RESULT_NAMES = {code: name for name, code in RESULT_CODES.items()}
+
+# Fixed-size record of the binary format; ai_strategy is an index into the sidecar's strategy list
+BINARY_DTYPE = np.dtype([
+    ("round", "<i8"), ("chunk", "<i4"), ("seat", "u1"), ("ai_strategy", "<u2"), ("bet", "<i4"),
+    ("old_balance", "<i8"), ("new_balance", "<i8"), ("result", "i1"),
+])
+DEFAULT_CHUNK_ROWS = 65_536 # Rows buffered before they are written out
+
+
+class RunningStats:
+    """Aggregates of one strategy's net results in O(1) memory.
+
+    Mean and variance use Welford's online update (merged per batch with Chan's formula);
+    the drawdown is the largest drop of the cumulative net result below its running peak.
+    """
+    def __init__(self):
+        self.rounds = 0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.total = 0 # Cumulative net result
+        self.peak = 0
+        self.max_drawdown = 0
+
+    def update(self, net):
+        """Adds one round's net result."""
+        self.rounds += 1
+        if net > 0: self.wins += 1
+        elif net < 0: self.losses += 1
+        else: self.pushes += 1
+
+        delta = net - self.mean
+        self.mean += delta / self.rounds
+        self._m2 += delta * (net - self.mean)
+
+        self.total += net
+        self.peak = max(self.peak, self.total)
+        self.max_drawdown = max(self.max_drawdown, self.peak - self.total)
+
+    def update_batch(self, net):
+        """Adds an array of net results, in round order."""
+        net = np.asarray(net, dtype=np.int64)
+        if net.size == 0: return
+        self.wins += int(np.count_nonzero(net > 0))
+        self.losses += int(np.count_nonzero(net < 0))
+        self.pushes += int(np.count_nonzero(net == 0))
+
+        batch_mean = float(net.mean())
+        batch_m2 = float(((net - batch_mean) ** 2).sum())
+        delta = batch_mean - self.mean
+        rounds = self.rounds + net.size
+        self.mean += delta * net.size / rounds
+        self._m2 += batch_m2 + delta * delta * self.rounds * net.size / rounds
+        self.rounds = rounds
+
+        cumulative = self.total + np.cumsum(net)
+        peaks = np.maximum.accumulate(np.maximum(cumulative, self.peak))
+        self.max_drawdown = max(self.max_drawdown, int((peaks - cumulative).max()))
+        self.total = int(cumulative[-1])
+        self.peak = int(peaks[-1])
+
+    @property
+    def variance(self):
+        """Sample variance of the net result per round."""
+        return self._m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    def summary(self):
+        """The aggregates as a plain dict."""
+        return {
+            "rounds": self.rounds, "wins": self.wins, "losses": self.losses, "pushes": self.pushes,
+            "mean": self.mean, "variance": self.variance, "total": self.total,
+            "max_drawdown": self.max_drawdown,
+        }
+
+
+class ResultsSink:
+    """Streams per-round records to disk in chunks and keeps RunningStats per strategy (and seat).
+
+    fmt is "csv" (the columns of RESULT_COLUMNS) or "binary": fixed-size BINARY_DTYPE
+    records appended to path, with the strategy names in a JSON sidecar (path + ".json")
+    written on close. Use as a context manager so the last chunk is flushed.
+    """
+    def __init__(self, path, fmt="csv", chunk_rows=DEFAULT_CHUNK_ROWS):
+        if fmt not in ("csv", "binary"):
+            raise ValueError(f"Unknown results format '{fmt}', expected 'csv' or 'binary'.")
+        self.path = path
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.stats = {}
+        self._strategies = {} # Strategy name -> index in the binary format
+        self._pending = [] # Buffered chunks of columns
+        self._pending_rows = 0
+        self._rows = [] # Buffered single records
+
+        if fmt == "csv":
+            self._file = open(path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(RESULT_COLUMNS)
+        else:
+            self._file = open(path, "wb")
+
+    def _stats_for(self, strategy, seat=0):
+        self._strategies.setdefault(strategy, len(self._strategies))
+        key = stats_key(strategy, seat)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RunningStats()
+        return stats
+
+    def add(self, record):
+        """Adds one per-round record (a dict with the RESULT_COLUMNS keys; 'chunk' and 'seat' are optional)."""
+        self._stats_for(record["ai_strategy"], record.get("seat", 0)).update(record["new_balance"] - record["old_balance"])
+        self._rows.append(record)
+        if len(self._rows) >= self.chunk_rows:
+            self.flush()
+
+    def add_columns(self, columns):
+        """Adds a block of records given as columns of equal length (e.g. batch_sim.results_table)."""
+        size = len(columns["round"])
+        if size == 0: return
+        columns = dict(columns)
+        columns.setdefault("chunk", np.zeros(size, dtype=np.int64))
+        columns.setdefault("seat", np.zeros(size, dtype=np.int64))
+        strategies = np.asarray(columns["ai_strategy"])
+        seats = np.asarray(columns["seat"])
+        net = np.asarray(columns["new_balance"], dtype=np.int64) - np.asarray(columns["old_balance"], dtype=np.int64)
+        for strategy, seat in dict.fromkeys(zip(strategies.tolist(), seats.tolist())): # Unique, in order of appearance
+            self._stats_for(strategy, seat).update_batch(net[(strategies == strategy) & (seats == seat)])
+
+        self._flush_rows()
+        self._pending.append(columns)
+        self._pending_rows += size
+        if self._pending_rows >= self.chunk_rows:
+            self.flush()
+
+    def _flush_rows(self):
+        """Moves buffered single records into a column chunk, keeping the record order."""
+        if not self._rows: return
+        columns = {name: [row.get(name, 0) for row in self._rows] for name in RESULT_COLUMNS}
+        self._rows = []
+        self._pending.append(columns)
+        self._pending_rows += len(columns["round"])
+
+    def flush(self):
+        """Writes all buffered records to the file."""
+        self._flush_rows()
+        for columns in self._pending:
+            if self.fmt == "csv":
+                self._writer.writerows(zip(*(np.asarray(columns[name]).tolist() for name in RESULT_COLUMNS)))
+            else:
+                block = np.empty(len(columns["round"]), dtype=BINARY_DTYPE)
+                for name in RESULT_COLUMNS:
+                    if name == "ai_strategy":
+                        block[name] = [self._strategies[s] for s in np.asarray(columns[name]).tolist()]
+                    elif name == "result":
+                        block[name] = [RESULT_CODES[r] for r in np.asarray(columns[name]).tolist()]
+                    else:
+                        block[name] = columns[name]
+                block.tofile(self._file)
+        self._pending = []
+        self._pending_rows = 0
+        self._file.flush()
+
+    def close(self):
+        """Flushes the remaining records and closes the file (and writes the binary sidecar)."""
+        if self._file.closed: return
+        self.flush()
+        self._file.close()
+        if self.fmt == "binary":
+            with open(self.path + ".json", "w", encoding="utf-8") as f:
+                json.dump({"dtype": BINARY_DTYPE.descr, "strategies": list(self._strategies)}, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stats_key(strategy, seat=0):
+    """Key of ResultsSink.stats: the strategy name, qualified by the seat for table runs."""
+    return strategy if not seat else f"{strategy} (seat {seat})"
+
+
+def read_binary_results(path):
+    """Memory-maps a binary results file. Returns (records, strategy names)."""
+    with open(path + ".json", encoding="utf-8") as f:
+        meta = json.load(f)
+    dtype = np.dtype([tuple(field) for field in meta["dtype"]])
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype), meta["strategies"] # np.memmap cannot map an empty file
+    return np.memmap(path, dtype=dtype, mode="r"), meta["strategies"]
@@ -0,0 +1,37 @@
+import heapq
+
+class Timeline:
+    """Queue of delayed actions, advanced from the main loop by frame time.
+
+    Nothing here ever sleeps: schedule() only records when an action is due, and
+    update(now_ms) runs every action whose time has come. Actions may schedule
+    further actions, which is how multi-step sequences (dealing, the dealer's turn)
+    are paced while the window keeps handling input and rendering.
+    """
+    def __init__(self):
+        self._queue = []
+        self._counter = 0 # Keeps actions that are due at the same time in scheduling order
+        self.now = 0
+
+    def schedule(self, delay_ms, action, *args):
+        """Runs action(*args) delay_ms after the current timeline time."""
+        heapq.heappush(self._queue, (self.now + delay_ms, self._counter, action, args))
+        self._counter += 1
+
+    def update(self, now_ms):
+        """Advances the timeline to now_ms and runs every action that is due."""
+        self.now = now_ms
+        while self._queue and self._queue[0][0] <= now_ms:
+            due, _, action, args = heapq.heappop(self._queue)
+            self.now = due # Follow-up actions are scheduled relative to when this one was due
+            action(*args)
+        self.now = now_ms
+
+    def clear(self):
+        """Drops all pending actions."""
+        self._queue.clear()
+
+    @property
+    def busy(self):
+        """True while any action is still pending."""
+        return bool(self._queue)
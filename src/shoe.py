@@ -0,0 +1,84 @@
+import numpy as np
+from constants import DEFAULT_NUM_DECKS, SHOE_PENETRATION
+from hand import NUM_CARD_CODES, RANKS_PER_SUIT
+
+# Hi-Lo count value per rank (ace..king): 2-6 count +1, 7-9 count 0, tens and aces -1
+HILO_BY_RANK = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1)
+HILO_BY_CODE = HILO_BY_RANK * (NUM_CARD_CODES // RANKS_PER_SUIT)
+
+def _seed_of(rng):
+    """Low 64 bits of the integer seed a Generator was created from, or 0 if it was not seeded with one."""
+    entropy = getattr(getattr(rng.bit_generator, "seed_seq", None), "entropy", None)
+    return entropy & 0xFFFF_FFFF_FFFF_FFFF if isinstance(entropy, int) else 0
+
+def _stream_of(rng):
+    """Index of the SeedSequence.spawn child a Generator was created from (last spawn_key entry), or -1 for a root seed.
+
+    Spawned children share their parent's entropy, so only this tells the streams of one seed apart.
+    """
+    spawn_key = getattr(getattr(rng.bit_generator, "seed_seq", None), "spawn_key", ())
+    return int(spawn_key[-1]) if spawn_key else -1
+
+class Shoe:
+    """A multi-deck shoe stored as a uint8 array of card codes with a draw cursor.
+
+    The buffer is allocated once and reshuffled in place, and the remaining count
+    per rank and the Hi-Lo running count are kept up to date on every draw, so long
+    simulations do not allocate per shoe and strategies can read the composition and
+    the count without scanning the cards.
+    """
+    def __init__(self, num_decks=DEFAULT_NUM_DECKS, penetration=SHOE_PENETRATION, rng=None):
+        self.num_decks = max(1, num_decks)
+        self.cards = np.tile(np.arange(NUM_CARD_CODES, dtype=np.uint8), self.num_decks)
+        self.size = self.cards.size
+        self._view = memoryview(self.cards) # Zero-copy view; reads return plain ints without NumPy scalar overhead
+        # Position of the cut card: once more cards than this are dealt, the shoe is due a reshuffle
+        self.cut_card = int(self.size * penetration)
+        self.rng = np.random.default_rng(rng) # Accepts a Generator, a seed or None
+        self.seed = _seed_of(self.rng) # With stream and shuffles, identifies the card order in hand histories
+        self.stream = _stream_of(self.rng)
+        self.shuffles = 0
+        self.rank_counts = [4 * self.num_decks] * RANKS_PER_SUIT
+        self.running_count = 0 # Hi-Lo count of the cards dealt since the last shuffle
+        self.cursor = 0
+        self.shuffle()
+
+    def shuffle(self):
+        """Puts all cards back and shuffles them in place."""
+        self.rng.shuffle(self.cards)
+        self.shuffles += 1
+        self.cursor = 0
+        self.rank_counts[:] = [4 * self.num_decks] * RANKS_PER_SUIT
+        self.running_count = 0
+
+    @property
+    def needs_shuffle(self):
+        """True once the cut card has been reached."""
+        return self.cursor > self.cut_card
+
+    def draw(self):
+        """Deals the next card code, starting a fresh shoe if this one is empty."""
+        if self.cursor >= self.size:
+            self.shuffle()
+        code = self._view[self.cursor]
+        self.cursor += 1
+        self.rank_counts[code % RANKS_PER_SUIT] -= 1
+        self.running_count += HILO_BY_CODE[code]
+        return code
+
+    @property
+    def decks_remaining(self):
+        """Undealt cards in decks, never below a quarter deck so the true count stays bounded."""
+        return max(self.size - self.cursor, 13) / 52
+
+    @property
+    def true_count(self):
+        """Running count per remaining deck."""
+        return self.running_count / self.decks_remaining
+
+    def composition(self):
+        """Returns the number of remaining cards per rank index (ace..king) as an array."""
+        return np.array(self.rank_counts, dtype=np.int32)
+
+    def __len__(self):
+        return self.size - self.cursor
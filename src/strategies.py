@@ -0,0 +1,143 @@
+import csv
+import json
+import os
+import numpy as np
+from constants import (
+    PLAYER_AI_STAND_THRESHOLD, STRAT_DEALER_MIMIC, STRAT_NEVER_BUST, STRAT_BASIC_HARD,
+    STRAT_CAUTIOUS, STRAT_AGGRESSIVE, STRAT_OPTIMAL
+)
+
+# Actions stored in a strategy table
+STAND, HIT = 0, 1
+ACTION_CODES = {"S": STAND, "H": HIT}
+ACTION_LETTERS = {STAND: "S", HIT: "H"}
+
+# A strategy table is indexed by [player total, soft flag, dealer upcard value (ace = 11)]
+TABLE_SHAPE = (32, 2, 12)
+UPCARDS = range(2, 12)
+CHART_COLUMNS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "A"]
+
+
+def compile_strategy(stands):
+    """Evaluates stands(total, soft, upcard) -> bool once for every state and returns the table."""
+    table = np.full(TABLE_SHAPE, STAND, dtype=np.uint8)
+    for total in range(TABLE_SHAPE[0]):
+        for soft in (False, True):
+            for upcard in UPCARDS:
+                if not stands(total, soft, upcard):
+                    table[total, int(soft), upcard] = HIT
+    table.setflags(write=False)
+    return table
+
+def _cautious_stands(total, soft, upcard):
+    """Stands earlier against a weak dealer upcard (2-6)."""
+    return total >= (12 if 2 <= upcard <= 6 else 17)
+
+def _basic_hard_stands(total, soft, upcard):
+    """Simplified basic strategy for hard hands."""
+    return (total >= 17
+            or (13 <= total <= 16 and 2 <= upcard <= 6)
+            or (total == 12 and 4 <= upcard <= 6))
+
+# The built-in rule-based strategies, compiled once at import
+STRATEGY_REGISTRY = {
+    STRAT_DEALER_MIMIC: compile_strategy(lambda total, soft, upcard: total >= PLAYER_AI_STAND_THRESHOLD),
+    STRAT_NEVER_BUST: compile_strategy(lambda total, soft, upcard: total >= 12),
+    STRAT_BASIC_HARD: compile_strategy(_basic_hard_stands),
+    STRAT_CAUTIOUS: compile_strategy(_cautious_stands),
+    STRAT_AGGRESSIVE: compile_strategy(lambda total, soft, upcard: total >= 19),
+}
+
+
+def validate_table(table):
+    """Checks the shape and contents of a strategy table and returns it as a read-only uint8 array."""
+    table = np.array(table, dtype=np.uint8)
+    if table.shape != TABLE_SHAPE:
+        raise ValueError(f"Strategy table must have shape {TABLE_SHAPE}, got {table.shape}")
+    if not np.isin(table, (STAND, HIT)).all():
+        raise ValueError("Strategy table may only contain STAND (0) and HIT (1)")
+    table.setflags(write=False)
+    return table
+
+def register_strategy(name, table):
+    """Adds (or replaces) a strategy table in the registry under the given name."""
+    STRATEGY_REGISTRY[name] = validate_table(table)
+    return STRATEGY_REGISTRY[name]
+
+def get_strategy(strategy):
+    """Returns the compiled table for a registered strategy name, or validates a table passed directly."""
+    if isinstance(strategy, str):
+        try:
+            return STRATEGY_REGISTRY[strategy]
+        except KeyError:
+            raise KeyError(f"Unknown strategy '{strategy}'. Registered: {', '.join(STRATEGY_REGISTRY)}") from None
+    return validate_table(strategy)
+
+def resolve_strategy(strategy):
+    """Strategy table for a name or table, or None for STRAT_OPTIMAL (decided per hand from exact EVs)."""
+    if isinstance(strategy, str) and strategy == STRAT_OPTIMAL:
+        return None
+    return get_strategy(strategy)
+
+def strategy_name(strategy):
+    """Returns a printable name for a strategy given as a name or a table."""
+    return strategy if isinstance(strategy, str) else "CUSTOM"
+
+
+def _chart_to_table(chart):
+    """Builds a table from chart rows like {"H12": "HHSSSHHHHH", "S18": "SSSSSSSHHH"}.
+
+    Row keys are H (hard) or S (soft) followed by the player total; each row holds one
+    action per dealer upcard 2..10, A. States not in the chart follow DEALER_MIMIC.
+    """
+    table = np.array(STRATEGY_REGISTRY[STRAT_DEALER_MIMIC])
+    for hand, actions in chart.items():
+        kind, total = hand[0].upper(), int(hand[1:])
+        if kind not in "HS" or len(actions) != len(UPCARDS):
+            raise ValueError(f"Invalid chart row {hand}: {actions}")
+        for upcard, action in zip(UPCARDS, actions):
+            table[total, int(kind == "S"), upcard] = ACTION_CODES[action.upper()]
+    return validate_table(table)
+
+def _table_to_chart(table):
+    """Inverse of _chart_to_table for the totals a player can actually decide on (4-21)."""
+    chart = {}
+    for soft, kind, first in ((0, "H", 4), (1, "S", 12)):
+        for total in range(first, 22):
+            chart[f"{kind}{total}"] = "".join(ACTION_LETTERS[int(table[total, soft, up])] for up in UPCARDS)
+    return chart
+
+def load_strategy_table(path, name=None):
+    """Loads a strategy chart from a .json or .csv file and registers it.
+
+    JSON files hold an object of chart rows ({"H12": "HHSSSHHHHH", ...}); CSV files have a
+    header 'hand,2,3,4,5,6,7,8,9,10,A' and one row per hand. The strategy is registered
+    under name, or the file name without extension. Returns the registered name.
+    """
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            chart = json.load(f)
+    elif path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            chart = {row["hand"]: "".join(row[col].strip() for col in CHART_COLUMNS) for row in csv.DictReader(f)}
+    else:
+        raise ValueError(f"Unsupported strategy file type: {path}")
+    register_strategy(name, _chart_to_table(chart))
+    return name
+
+def save_strategy_table(strategy, path):
+    """Writes a strategy (name or table) as a .json or .csv chart that load_strategy_table can read."""
+    chart = _table_to_chart(get_strategy(strategy))
+    if path.lower().endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(chart, f, indent=2)
+    elif path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["hand"] + CHART_COLUMNS)
+            for hand, actions in chart.items():
+                writer.writerow([hand] + list(actions))
+    else:
+        raise ValueError(f"Unsupported strategy file type: {path}")
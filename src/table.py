@@ -0,0 +1,220 @@
+from constants import (
+    DEFAULT_NUM_DECKS, SHOE_PENETRATION, STARTING_BALANCE, AI_STRATEGY,
+    AI_BET_SPREAD, AI_DEVIATIONS, TABLE_MAX_SEATS
+)
+from hand import Hand
+from strategies import STAND, HIT, resolve_strategy, strategy_name
+from counting import get_bet_spread, get_deviations
+from engine import BlackjackEngine, settle_hand, ai_action
+
+class Seat:
+    """One player at a table: own strategy, bet spread, index plays, balance and hand."""
+    def __init__(self, strategy=AI_STRATEGY, bet_spread=AI_BET_SPREAD, deviations=AI_DEVIATIONS,
+                 balance=STARTING_BALANCE, name=None):
+        self.strategy_table = resolve_strategy(strategy)
+        self.strategy = strategy_name(strategy)
+        self.bet_spread = get_bet_spread(bet_spread)
+        self.deviations = get_deviations(deviations)
+        self.balance = balance
+        self.name = name or self.strategy
+        self.hand = Hand()
+        self.actions = [] # STAND/HIT of the current round, for the hand history
+        self.current_bet = 0
+        self.last_bet = 0 # Kept after the round is reset, for result records
+        self.last_payout = None # None when the seat sat out the last round
+
+    def __repr__(self):
+        return f"Seat({self.name!r}, balance={self.balance})"
+
+
+class BlackjackTable(BlackjackEngine):
+    """Headless multi-seat Blackjack: up to TABLE_MAX_SEATS seats against one dealer, sharing one shoe.
+
+    Seats are dealt and play in order (seat 1 first), and the dealer plays once per round for
+    all seats still in. The dealer side (drawing, the count, reshuffling) is BlackjackEngine's;
+    player_hand and current_bet refer to the seat whose turn it is, so the engine's turn
+    methods and the exact-EV AI work on the active seat.
+    """
+    def __init__(self, seats=1, num_decks=DEFAULT_NUM_DECKS, seed=None, penetration=SHOE_PENETRATION, history=None):
+        # seats: a number of default seats, or a list of Seat objects and/or strategy names
+        if isinstance(seats, int):
+            seats = [Seat() for _ in range(seats)]
+        self.seats = [seat if isinstance(seat, Seat) else Seat(seat) for seat in seats]
+        if not 1 <= len(self.seats) <= TABLE_MAX_SEATS:
+            raise ValueError(f"A table has 1 to {TABLE_MAX_SEATS} seats, got {len(self.seats)}")
+        self.round_seats = [] # Seats with a bet in the current round, in playing order
+        self.active = None # Index into round_seats of the seat whose turn it is
+        # history: every seat's hand of a resolved round is appended to it, with its seat number
+        super().__init__(num_decks=num_decks, seed=seed, penetration=penetration, history=history)
+
+    def _init_player(self, strategy, bet_spread, deviations):
+        """The player side lives in the seats."""
+
+    @property
+    def active_seat(self):
+        return self.round_seats[self.active] if self.active is not None else None
+
+    @property
+    def player_hand(self):
+        seat = self.active_seat
+        return seat.hand if seat is not None else Hand()
+
+    @property
+    def player_actions(self):
+        seat = self.active_seat
+        return seat.actions if seat is not None else []
+
+    @property
+    def current_bet(self):
+        seat = self.active_seat
+        return seat.current_bet if seat is not None else 0
+
+    @property
+    def balance(self):
+        """Total balance of all seats."""
+        return sum(seat.balance for seat in self.seats)
+
+    def seat_label(self, seat):
+        return f"Seat {self.seats.index(seat) + 1}"
+
+    def reset_round(self):
+        """Clears all hands and bets and prepares for a new round."""
+        for seat in self.seats:
+            seat.hand = Hand()
+            seat.actions = []
+            seat.current_bet = 0
+        self.dealer_hand = Hand()
+        self.dealer_actions = []
+        self.round_seats = []
+        self.active = None
+        self.message = ""
+        self.game_state = "BETTING"
+        self.check_deck()
+
+    def choose_bet(self):
+        """Total of the bets the seats would place now."""
+        true_count = self.true_count()
+        return sum(seat.bet_spread.bet(true_count, seat.balance) for seat in self.seats)
+
+    def place_bet(self, amount=None):
+        """Places every seat's bet (amount, or the seat's own bet spread); seats that cannot cover it sit out."""
+        if self.game_state != "BETTING": return False
+        true_count = self.true_count()
+        self.round_seats = []
+        for seat in self.seats:
+            bet = amount if amount is not None else seat.bet_spread.bet(true_count, seat.balance)
+            if 0 < bet <= seat.balance:
+                seat.current_bet = seat.last_bet = bet
+                self.round_seats.append(seat)
+            else:
+                seat.last_payout = None
+        if not self.round_seats:
+            self.message = "No seat can cover a bet!"
+            return False
+        self.message = f"Bets placed: €{sum(seat.current_bet for seat in self.round_seats)}"
+        self.game_state = "DEALING"
+        return True
+
+    def deal_card(self, to_player=True, seat=None):
+        """Deals one card to a seat (default: the active seat) or, with to_player False, to the dealer."""
+        card = self.shoe.draw()
+        if not to_player:
+            self.dealer_hand.add(card)
+        else:
+            (seat or self.active_seat).hand.add(card)
+        return card
+
+    def initial_deal_order(self):
+        """(seat, or None for the dealer) in the order the starting cards are dealt."""
+        one_pass = list(self.round_seats) + [None]
+        return one_pass + one_pass
+
+    def deal_initial_cards(self):
+        """Deals two cards to every seat in the round and to the dealer, one pass at a time."""
+        if self.game_state != "DEALING": return
+        for seat in self.initial_deal_order():
+            self.deal_card(to_player=seat is not None, seat=seat)
+        self.check_initial_blackjack()
+
+    def check_initial_blackjack(self):
+        """Ends the round on a dealer Blackjack; otherwise the first seat that has to decide is up."""
+        if self.dealer_hand.is_blackjack:
+            self.resolve_round()
+        else:
+            self._next_seat(0)
+
+    def _next_seat(self, start):
+        """Gives the turn to the first seat from start that can still act, else to the dealer."""
+        for index in range(start, len(self.round_seats)):
+            if self.round_seats[index].hand.total < 21:
+                self.active = index
+                self.game_state = "PLAYER_TURN"
+                self.message = f"{self.seat_label(self.active_seat)}'s Turn"
+                return
+        self.active = None
+        if any(seat.hand.total <= 21 and not seat.hand.is_blackjack for seat in self.round_seats):
+            self.game_state = "DEALER_TURN"
+        else:
+            self.resolve_round() # Every seat busted or has Blackjack: the dealer does not draw
+
+    def player_hit(self):
+        """The active seat takes another card."""
+        if self.game_state != "PLAYER_TURN": return
+        seat = self.active_seat
+        seat.actions.append(HIT)
+        self.deal_card(seat=seat)
+        score = seat.hand.total
+        self.message = f"{self.seat_label(seat)} Hits. Score: {score}"
+        if score > 21:
+            self.message = f"{self.seat_label(seat)} Busts! Score: {score}"
+        if score >= 21:
+            self._next_seat(self.active + 1)
+
+    def player_stand(self):
+        """The active seat stands."""
+        if self.game_state != "PLAYER_TURN": return
+        self.active_seat.actions.append(STAND)
+        self.message = f"{self.seat_label(self.active_seat)} Stands. Score: {self.player_hand.total}"
+        self._next_seat(self.active + 1)
+
+    def player_ai_action(self):
+        """The active seat plays its own strategy."""
+        if self.game_state != "PLAYER_TURN": return
+        seat = self.active_seat
+        if ai_action(self, seat.strategy_table, seat.deviations) == STAND:
+            self.player_stand()
+        else:
+            self.player_hit()
+
+    def resolve_round(self):
+        """Settles every seat in the round. Returns the payouts per seat (None for seats that sat out)."""
+        if self.game_state == "ROUND_OVER": return None
+        if self.game_state == "DEALER_TURN" and not self.dealer_hand.is_bust:
+            self.dealer_actions.append(STAND)
+        self.game_state = "ROUND_OVER"
+        self.active = None
+
+        dealt = len(self.dealer_hand) + sum(len(seat.hand) for seat in self.round_seats)
+        for seat in self.round_seats:
+            payout, _ = settle_hand(seat.hand, self.dealer_hand, seat.current_bet)
+            seat.balance += payout
+            seat.last_payout = payout
+            if self.history is not None:
+                self.history.record_hand(self, seat.hand, seat.actions, seat.strategy, seat.current_bet, payout,
+                                         dealt, self.seats.index(seat) + 1)
+        net = sum(seat.last_payout for seat in self.round_seats)
+        self.message = f"Dealer {self.dealer_hand.total} | Table net: €{net} | Balance: €{self.balance}"
+        return [seat.last_payout for seat in self.seats]
+
+    def play_round(self, bet_amount=None):
+        """Plays one complete round with every seat on its AI. Returns the payouts per seat, or None if nobody bet."""
+        if not self.place_bet(bet_amount):
+            return None
+        self.deal_initial_cards()
+        while self.game_state == "PLAYER_TURN":
+            self.player_ai_action()
+        if self.game_state == "DEALER_TURN":
+            self.dealer_play()
+        payouts = [seat.last_payout for seat in self.seats]
+        self.reset_round()
+        return payouts
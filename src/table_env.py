@@ -0,0 +1,77 @@
+import logging
+from constants import (
+    SCREEN_WIDTH, CARD_WIDTH, MAX_CARDS_DISPLAY, DEFAULT_NUM_DECKS, TABLE_SEAT_Y, TABLE_CARD_CASCADE
+)
+from table import BlackjackTable
+from blackjack_env import CardSpriteView
+from renderer import build_table_scene
+from log import get_logger
+
+logger = get_logger(__name__)
+
+class BlackjackTableEnv(CardSpriteView, BlackjackTable):
+    """A multi-seat table (see table.BlackjackTable) with Pygame visualization.
+
+    Every seat gets a slot of the screen width; its cards cascade down from TABLE_SEAT_Y.
+    All seats are played by their AI, paced by the same timeline as BlackjackEnv.
+    """
+    scene_builder = staticmethod(build_table_scene)
+
+    def __init__(self, deck_image=None, card_images=None, seats=1, num_decks=DEFAULT_NUM_DECKS, seed=None,
+                 history=None):
+        super().__init__(seats=seats, num_decks=num_decks, seed=seed, history=history)
+        self._init_view(deck_image, card_images)
+        slot_width = SCREEN_WIDTH // len(self.seats)
+        self.seat_cards = [[] for _ in self.seats]
+        self.seat_positions = [
+            [
+                (slot_width * s + (slot_width - CARD_WIDTH) // 2 + i * TABLE_CARD_CASCADE[0], TABLE_SEAT_Y + i * TABLE_CARD_CASCADE[1])
+                for i in range(MAX_CARDS_DISPLAY * 2)
+            ]
+            for s in range(len(self.seats))
+        ]
+
+    @property
+    def player_cards(self):
+        return [card_obj for cards in self.seat_cards for card_obj in cards]
+
+    def reset_round(self):
+        """Resets all hands and card sprites and prepares for a new round."""
+        self.seat_cards = [[] for _ in self.seats]
+        self.dealer_cards = []
+        self.tweens.clear()
+        super().reset_round()
+
+    def all_cards(self):
+        return self.dealer_cards + self.player_cards
+
+    def initial_deals(self):
+        return [(seat is not None, seat) for seat in self.initial_deal_order()]
+
+    def deal_card(self, to_player=True, seat=None):
+        """Deals one card to a seat (default: the active seat) or the dealer and spawns its sprite."""
+        card = super().deal_card(to_player=to_player, seat=seat)
+        if to_player:
+            seat = seat or self.active_seat
+            index = self.seats.index(seat)
+            self._add_sprite(card, seat.hand, self.seat_cards[index], self.seat_positions[index], self.seat_label(seat))
+        else:
+            self._add_sprite(card, self.dealer_hand, self.dealer_cards, self.dealer_positions, "Dealer")
+        return card
+
+    def resolve_round(self):
+        """Settles every seat and prints the round summary."""
+        payouts = super().resolve_round()
+        if payouts is None: return None
+
+        if not self.headless and logger.isEnabledFor(logging.INFO): # The hand reprs are only built when they are shown
+            lines = ["--- Round Result ---", f"Dealer Hand: {self.dealer_hand}"]
+            for seat, payout in zip(self.seats, payouts):
+                if payout is None:
+                    lines.append(f"{self.seat_label(seat)} ({seat.name}): sat out")
+                else:
+                    lines.append(f"{self.seat_label(seat)} ({seat.name}): {seat.hand} | Bet: €{seat.current_bet}, "
+                                 f"Payout: €{payout}, Balance: €{seat.balance}")
+            lines.append(self.message)
+            logger.info("\n".join(lines))
+        return payouts
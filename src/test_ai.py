@@ -1,47 +1,37 @@
-import os 
-import pygame 
-import numpy as np 
-import pandas as pd
-
-from constants import ( SCREEN_WIDTH, SCREEN_HEIGHT, DEFAULT_BET, STRAT_DEALER_MIMIC, STRAT_NEVER_BUST, STRAT_BASIC_HARD, STRAT_CAUTIOUS, STRAT_AGGRESSIVE ) 
-from blackjack_env import BlackjackEnv 
-from utils import load_card_images
-
-def simulate_ai(strategy, rounds, bet_amount): 
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags=pygame.HIDDEN)
-
-    # Load game assets.
-    deck_image, card_images = load_card_images()
-    if deck_image is None or not card_images:
-        print("Failed to load assets.")
-        return []
-
-    # Create a new Blackjack environment.
-    env = BlackjackEnv(deck_image, card_images, num_decks=3)
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from constants import ( DEFAULT_BET, STARTING_BALANCE, STRAT_DEALER_MIMIC, STRAT_NEVER_BUST, STRAT_BASIC_HARD, STRAT_CAUTIOUS, STRAT_AGGRESSIVE )
+from engine import BlackjackEngine
+from table import BlackjackTable
+from batch_sim import iter_batches, iter_common_batches, results_table
+from results import ResultsSink
+from comparison import compare_strategies
+from log import get_logger, configure_logging
+
+logger = get_logger(__name__)
+
+def simulate_ai(strategy, rounds, bet_amount, seed=None, first_round=1, chunk=0):
+    """Plays rounds with one engine; seed is an int or numpy SeedSequence (None: unseeded)."""
+    # Create a new headless Blackjack engine; no display or card images are needed.
+    env = BlackjackEngine(num_decks=3, strategy=strategy, seed=seed)
     results = []
 
-    for r in range(1, rounds + 1):
+    for r in range(first_round, first_round + rounds):
         if env.balance < bet_amount:
-            print(f"Insufficient funds for strategy {strategy} at round {r}. Ending simulation for this AI.")
+            logger.info("Insufficient funds for strategy %s at round %d. Ending simulation for this AI.", strategy, r)
             break
-        
+
         old_balance = env.balance
 
-        # Place bet, which sets the game_state to "DEALING"
-        if not env.place_bet(bet_amount):
-            print(f"Failed to place bet on round {r} for strategy {strategy}.")
+        # Place bet, deal, let the AI play and resolve the round.
+        if env.play_round(bet_amount) is None:
+            logger.warning("Failed to place bet on round %d for strategy %s.", r, strategy)
             break
 
-        # Deal the initial cards.
-        env.deal_initial_cards()
-
-        # Let the AI play until the round is resolved.
-        while env.game_state == "PLAYER_TURN":
-            env.player_ai_action()
-
-        if env.game_state == "DEALER_TURN":
-            env.dealer_play(screen)
-
         # Round is now over. Calculate result.
         new_balance = env.balance
         net_change = new_balance - old_balance
@@ -50,6 +40,7 @@ def simulate_ai(strategy, rounds, bet_amount):
         # Record round details.
         results.append({
             "round": r,
+            "chunk": chunk,
             "ai_strategy": strategy,
             "bet": bet_amount,
             "old_balance": old_balance,
@@ -57,11 +48,129 @@ def simulate_ai(strategy, rounds, bet_amount):
             "result": outcome
         })
 
-        # Reset environment for next round.
-        env.reset_round()
+    return results
+
+def simulate_table(seats, rounds, bet_amount=None, seed=None, sink=None):
+    """Plays rounds at one multi-seat table (see table.BlackjackTable) sharing a single shoe.
 
+    seats is a list of strategy names or table.Seat objects. Each seat's per-round record
+    (with its 1-based seat number) goes to sink.add if a sink is given, else into the returned list.
+    """
+    table = BlackjackTable(seats, seed=seed)
+    results = []
+    for r in range(1, rounds + 1):
+        old_balances = [seat.balance for seat in table.seats]
+        payouts = table.play_round(bet_amount)
+        if payouts is None:
+            logger.info("No seat can cover a bet at round %d. Ending table simulation.", r)
+            break
+        for number, (seat, old_balance, payout) in enumerate(zip(table.seats, old_balances, payouts), start=1):
+            if payout is None: continue # Sat out this round
+            record = {
+                "round": r,
+                "seat": number,
+                "ai_strategy": seat.strategy,
+                "bet": seat.last_bet,
+                "old_balance": old_balance,
+                "new_balance": seat.balance,
+                "result": "win" if payout > 0 else "loss" if payout < 0 else "push",
+            }
+            if sink is not None:
+                sink.add(record)
+            else:
+                results.append(record)
     return results
-def main(): 
+
+def iter_ai_batch(strategy, rounds, bet_amount, rng=None):
+    """Yields the per-round columns of the vectorized batch simulator block by block.
+
+    The rounds form one sequence played from STARTING_BALANCE, ending early when the
+    balance no longer covers the bet, like simulate_ai. Only one block is in memory at a time.
+    """
+    balance, first_round = STARTING_BALANCE, 1
+    for net in iter_batches(strategy, rounds, bet_amount, rng=rng):
+        columns = results_table(strategy, net, bet_amount, starting_balance=balance)
+        columns["round"] += first_round - 1
+        yield columns
+        if columns["round"].size < net.size: return # Ran out of balance
+        balance = int(columns["new_balance"][-1])
+        first_round += net.size
+
+def iter_common_ai_batch(strategies, rounds, bet_amount, rng=None):
+    """Like iter_ai_batch for several strategies playing the same cards (see batch_sim.play_common_round).
+
+    Yields each strategy's columns per block; a strategy that can no longer cover the bet stops
+    while the others play on.
+    """
+    balances = dict.fromkeys(strategies, STARTING_BALANCE)
+    first_round = 1
+    for net in iter_common_batches(strategies, rounds, bet_amount, rng=rng):
+        for strategy, row in zip(strategies, net):
+            if strategy not in balances: continue # Ran out of balance
+            columns = results_table(strategy, row, bet_amount, starting_balance=balances[strategy])
+            columns["round"] += first_round - 1
+            yield columns
+            if columns["round"].size < row.size:
+                del balances[strategy]
+            else:
+                balances[strategy] = int(columns["new_balance"][-1])
+        if not balances: return
+        first_round += net.shape[1]
+
+def simulate_ai_batch(strategy, rounds, bet_amount):
+    """Same per-round columns as simulate_ai, but computed with the vectorized batch simulator."""
+    blocks = list(iter_ai_batch(strategy, rounds, bet_amount))
+    if not blocks:
+        return results_table(strategy, np.zeros(0, dtype=np.int64), bet_amount)
+    return {name: np.concatenate([block[name] for block in blocks]) for name in blocks[0]}
+
+def iter_sweep(strategies, rounds_per_strategy, bet_amount, chunk_rounds=10_000,
+               max_workers=None, base_seed=None, common_shoes=False):
+    """Simulates every strategy in parallel, split into (strategy, round-chunk) work units.
+
+    Each work unit runs in its own process with its own engine, starting from STARTING_BALANCE,
+    and its own independent RNG stream: child k of SeedSequence(base_seed).spawn, i.e.
+    SeedSequence(base_seed, spawn_key=(k,)). With common_shoes the streams are per chunk instead,
+    so every strategy plays the same sequence of shoes and the differences between strategies
+    are less noisy. The base seed is logged, so any round can be replayed with simulate_ai.
+    Yields each unit's per-round records, ordered by strategy and round.
+    """
+    chunks = range(1, rounds_per_strategy + 1, chunk_rounds)
+    seed_sequence = np.random.SeedSequence(base_seed)
+    logger.info("Sweep seed %d%s", seed_sequence.entropy, " (common shoes)" if common_shoes else "")
+    chunk_seeds = seed_sequence.spawn(len(chunks)) if common_shoes else None
+    units, seeds = [], []
+    for strat in strategies:
+        for chunk, first_round in enumerate(chunks):
+            rounds = min(chunk_rounds, rounds_per_strategy + 1 - first_round)
+            units.append((strat, rounds, first_round, chunk))
+            seeds.append(chunk_seeds[chunk] if common_shoes else None)
+    if not common_shoes:
+        seeds = seed_sequence.spawn(len(units))
+
+    # Only a bounded window of units is in flight, so results that finish out of order
+    # cannot pile up: a new unit is submitted each time the oldest one is yielded.
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = deque()
+        for (strat, rounds, first_round, chunk), seed in zip(units, seeds):
+            futures.append(pool.submit(simulate_ai, strat, rounds, bet_amount, seed, first_round, chunk))
+            if len(futures) >= window:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+def sweep_strategies(strategies, rounds_per_strategy, bet_amount, chunk_rounds=10_000,
+                     max_workers=None, base_seed=None, common_shoes=False):
+    """Like iter_sweep, but returns the merged list of per-round records."""
+    return [
+        record
+        for unit in iter_sweep(strategies, rounds_per_strategy, bet_amount, chunk_rounds, max_workers, base_seed,
+                               common_shoes)
+        for record in unit
+    ]
+
+def main(use_batch=False, max_workers=None, fmt="csv", compare=False, seed=None, common_shoes=False, seats=1):
     rounds_per_strategy = 100
     bet_amount = DEFAULT_BET
 
@@ -73,27 +182,53 @@ def main():
         STRAT_AGGRESSIVE
     ]
 
-    all_results = []
-    for strat in strategies:
-        print(f"Simulating strategy: {strat}")
-        results = simulate_ai(strat, rounds_per_strategy, bet_amount)
-        all_results.extend(results)
-
-    # Convert results to a pandas DataFrame.
-    df = pd.DataFrame(all_results)
-
-    # Optionally use numpy to ensure numerical types, if needed.
-    numeric_cols = ["round", "bet", "old_balance", "new_balance"]
-    df[numeric_cols] = df[numeric_cols].apply(np.int64)
+    if compare:
+        # Play until the ranking is statistically settled instead of a fixed number of rounds
+        print(f"Comparing strategies: {', '.join(strategies)}")
+        comparison = compare_strategies(strategies, verbose=True, bet_amount=bet_amount, seed=seed)
+        print("\n".join(comparison.report()))
+        return
 
-    # Write the DataFrame to a CSV file.
+    # Records are streamed to the file in chunks; only the per-strategy aggregates stay in memory.
     output_folder = 'tests'
     os.makedirs(output_folder, exist_ok=True)
-    output_file = os.path.join(output_folder, "ai_simulation_results.csv")
-    
-    df.to_csv(output_file, index=False)
-
+    output_file = os.path.join(output_folder, "ai_simulation_results." + ("csv" if fmt == "csv" else "bin"))
+
+    with ResultsSink(output_file, fmt=fmt) as sink:
+        if seats > 1:
+            # One table sharing a shoe, the strategies taking the seats in turn
+            table_seats = [strategies[i % len(strategies)] for i in range(seats)]
+            print(f"Simulating a table of {seats} seats: {', '.join(table_seats)}")
+            simulate_table(table_seats, rounds_per_strategy, bet_amount, seed=seed, sink=sink)
+        elif use_batch and common_shoes:
+            print(f"Simulating strategies on common shoes: {', '.join(strategies)}")
+            for columns in iter_common_ai_batch(strategies, rounds_per_strategy, bet_amount,
+                                                np.random.default_rng(seed)):
+                sink.add_columns(columns)
+        elif use_batch:
+            seeds = np.random.SeedSequence(seed).spawn(len(strategies))
+            for strat, strat_seed in zip(strategies, seeds):
+                print(f"Simulating strategy: {strat}")
+                for columns in iter_ai_batch(strat, rounds_per_strategy, bet_amount, np.random.default_rng(strat_seed)):
+                    sink.add_columns(columns)
+        else:
+            print(f"Simulating strategies in parallel: {', '.join(strategies)}")
+            for unit in iter_sweep(strategies, rounds_per_strategy, bet_amount, max_workers=max_workers,
+                                   base_seed=seed, common_shoes=common_shoes):
+                for record in unit:
+                    sink.add(record)
+
+    for strat, stats in sink.stats.items():
+        print(f"{strat}: {stats.rounds} rounds, W/L/P {stats.wins}/{stats.losses}/{stats.pushes}, "
+              f"mean €{stats.mean:.2f} (sd {stats.std:.2f}), max drawdown €{stats.max_drawdown}")
     print(f"Simulation complete. Results saved to {output_file}.")
-    pygame.quit()
-    
-if __name__ == "__main__": main()
\ No newline at end of file
+
+def _option(name, default=None, convert=str):
+    """Value of a --name=value command line argument, or default."""
+    return next((convert(arg.split("=", 1)[1]) for arg in sys.argv if arg.startswith(f"--{name}=")), default)
+
+if __name__ == "__main__":
+    configure_logging(ring_buffer=0)
+    main(use_batch="--batch" in sys.argv, max_workers=_option("workers", convert=int),
+         fmt=_option("format", "csv"), compare="--compare" in sys.argv, seed=_option("seed", convert=int),
+         common_shoes="--common-shoes" in sys.argv, seats=_option("seats", 1, int))
\ No newline at end of file
@@ -0,0 +1,46 @@
+import numpy as np
+from constants import STRAT_BASIC_HARD
+from engine import BlackjackEngine, settle_hand
+from hand import Hand
+from shoe import Shoe
+from batch_sim import settle, simulate_batch, results_table
+
+
+def test_settle_matches_engine():
+    shoe = Shoe(3, rng=np.random.default_rng(1))
+    player_total, dealer_total, player_bj, dealer_bj, expected = [], [], [], [], []
+    rng = np.random.default_rng(2)
+    for _ in range(2000):
+        if shoe.needs_shuffle:
+            shoe.shuffle()
+        player, dealer = Hand(), Hand()
+        for hand in (player, dealer, player, dealer):
+            hand.add(shoe.draw())
+        for _ in range(rng.integers(0, 3)):
+            player.add(shoe.draw())
+        while dealer.total < 17:
+            dealer.add(shoe.draw())
+        player_total.append(player.total)
+        dealer_total.append(dealer.total)
+        player_bj.append(player.is_blackjack)
+        dealer_bj.append(dealer.is_blackjack)
+        expected.append(settle_hand(player, dealer, 25)[0])
+    net = settle(np.array(player_total), np.array(dealer_total), np.array(player_bj), np.array(dealer_bj), 25)
+    assert net.tolist() == expected
+
+def test_batch_mean_matches_engine():
+    engine = BlackjackEngine(strategy=STRAT_BASIC_HARD, seed=1)
+    engine_net = np.empty(30_000)
+    for i in range(engine_net.size):
+        engine_net[i] = engine.play_round(10) / 10
+        engine.balance = 1_000_000
+    batch_net = simulate_batch(STRAT_BASIC_HARD, 300_000, 10, rng=np.random.default_rng(1)) / 10
+    error = np.hypot(engine_net.std() / np.sqrt(engine_net.size), batch_net.std() / np.sqrt(batch_net.size))
+    assert abs(engine_net.mean() - batch_net.mean()) < 4 * error
+
+def test_results_table_stops_before_ruin():
+    columns = results_table(STRAT_BASIC_HARD, np.array([-10, -10, 15, -10]), 10, starting_balance=20)
+    assert columns["round"].tolist() == [1, 2]
+    assert columns["old_balance"].tolist() == [20, 10]
+    assert columns["new_balance"].tolist() == [10, 0]
+    assert columns["result"].tolist() == ["loss", "loss"]
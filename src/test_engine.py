@@ -0,0 +1,21 @@
+from constants import STRAT_BASIC_HARD, STRAT_OPTIMAL
+from engine import BlackjackEngine
+from strategies import STRATEGY_REGISTRY
+from table import BlackjackTable, Seat
+
+
+def test_engine_accepts_strategy_table():
+    table = STRATEGY_REGISTRY[STRAT_BASIC_HARD]
+    env = BlackjackEngine(strategy=table, seed=1)
+    assert (env.strategy_table == table).all()
+    assert env.strategy == "CUSTOM"
+    assert env.play_round(10) is not None
+
+def test_engine_optimal_has_no_table():
+    env = BlackjackEngine(strategy=STRAT_OPTIMAL, seed=1)
+    assert env.strategy_table is None
+
+def test_table_seats_accept_strategy_table():
+    table = BlackjackTable([STRATEGY_REGISTRY[STRAT_BASIC_HARD], Seat(STRAT_OPTIMAL)], seed=1)
+    assert table.seats[0].strategy_table is not None
+    assert table.seats[1].strategy_table is None
@@ -0,0 +1,54 @@
+from functools import cache
+import pytest
+import ev
+from ev import DEALER_OUTCOMES, dealer_distribution, stand_ev, best_action, full_composition, remove_cards
+from strategies import STAND, HIT
+
+
+@cache
+def _dealer_brute_force(hard_total, has_ace, composition, hole_card, excluded):
+    """Dealer outcome probabilities by enumerating every draw; the hole card may not be the excluded value."""
+    total = hard_total + 10 if has_ace and hard_total <= 11 else hard_total
+    if hard_total > 21:
+        return {22: 1.0}
+    if total >= 17:
+        return {total: 1.0}
+    allowed = [(i, c) for i, c in enumerate(composition) if c and not (hole_card and i == excluded)]
+    remaining = sum(c for _, c in allowed)
+    outcomes = {}
+    for index, count in allowed:
+        rest = remove_cards(composition, (index + 1,))
+        for outcome, p in _dealer_brute_force(hard_total + index + 1, has_ace or index == 0, rest, False, excluded).items():
+            outcomes[outcome] = outcomes.get(outcome, 0.0) + count / remaining * p
+    return outcomes
+
+
+@pytest.mark.parametrize("upcard", range(1, 11))
+def test_dealer_distribution_matches_enumeration(upcard):
+    composition = remove_cards(full_composition(1), (upcard, 10, 6))
+    excluded = 9 if upcard == 1 else 0 if upcard == 10 else None
+    exact = _dealer_brute_force(upcard, upcard == 1, composition, True, excluded)
+    dist = dealer_distribution(upcard, composition)
+    assert sum(dist) == pytest.approx(1.0)
+    assert dist == pytest.approx(tuple(exact.get(outcome, 0.0) for outcome in DEALER_OUTCOMES))
+
+def test_stand_ev_below_17_only_wins_on_a_dealer_bust():
+    composition = remove_cards(full_composition(3), (10, 6, 9))
+    bust = dealer_distribution(9, composition)[-1]
+    for total in (4, 12, 16):
+        assert stand_ev(total, 9, composition) == pytest.approx(2 * bust - 1)
+    assert stand_ev(22, 9, composition) == -1.0
+
+@pytest.mark.parametrize("player, upcard, action", [
+    ((10, 2), 6, STAND), ((10, 2), 2, HIT), ((10, 3), 2, STAND), ((10, 5), 7, HIT),
+    ((10, 7), 10, STAND), ((1, 7), 9, HIT), ((1, 7), 7, STAND), ((5, 4), 10, HIT),
+])
+def test_best_action_follows_basic_strategy(player, upcard, action):
+    composition = remove_cards(full_composition(6), player + (upcard,))
+    assert best_action(player, upcard, composition) == action
+
+def test_hit_ev_never_below_bust():
+    ev.clear_caches()
+    composition = remove_cards(full_composition(3), (10, 6, 10))
+    ev_stand, ev_hit = ev.expected_values((10, 6), 10, composition)
+    assert -1.0 <= ev_hit <= 1.0 and ev_stand == pytest.approx(stand_ev(16, 10, composition))
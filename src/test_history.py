@@ -0,0 +1,51 @@
+import numpy as np
+from constants import STRAT_BASIC_HARD, STRAT_CAUTIOUS
+from engine import BlackjackEngine
+from table import BlackjackTable
+from hand import max_hand_cards
+from history import HandHistoryWriter, HandReplayer, read_hand_history, card_counts, NO_ENTRY
+
+
+def test_history_round_trip(tmp_path):
+    path = str(tmp_path / "hands.bin")
+    payouts = []
+    with HandHistoryWriter(path, num_decks=6, chunk_records=64) as log:
+        engine = BlackjackEngine(num_decks=6, strategy=STRAT_BASIC_HARD, seed=5, history=log)
+        for _ in range(500):
+            payouts.append(engine.play_round(10))
+
+    records, strategies = read_hand_history(path)
+    assert isinstance(records, np.memmap)
+    assert len(records) == 500 and strategies == [STRAT_BASIC_HARD]
+    assert records["player_cards"].shape[1] == max_hand_cards(6)
+    assert records["payout"].tolist() == payouts
+    assert (records["shoe_seed"] == 5).all() and (records["seat"] == 0).all()
+    players, dealers = card_counts(records)
+    assert (players >= 2).all() and (dealers >= 2).all()
+
+    replayer = HandReplayer(path, BlackjackEngine(num_decks=6, seed=0))
+    replayed = []
+    while (payout := replayer.play_round()) is not None:
+        replayed.append(payout)
+    assert replayed == payouts and replayer.divergences == 0
+
+def test_history_appends_and_logs_table_seats(tmp_path):
+    path = str(tmp_path / "hands.bin")
+    with HandHistoryWriter(path) as log:
+        engine = BlackjackEngine(strategy=STRAT_BASIC_HARD, seed=1, history=log)
+        engine.play_round(10)
+    with HandHistoryWriter(path) as log:
+        table = BlackjackTable([STRAT_BASIC_HARD, STRAT_CAUTIOUS], seed=2, history=log)
+        table.play_round(10)
+
+    records, strategies = read_hand_history(path)
+    assert strategies == [STRAT_BASIC_HARD, STRAT_CAUTIOUS]
+    assert records["seat"].tolist() == [0, 1, 2]
+    assert records["strategy"].tolist() == [0, 0, 1]
+    assert (records["player_actions"][:, -1] == NO_ENTRY).all()
+
+def test_unseeded_engine_logs_a_rebuildable_seed(tmp_path):
+    with HandHistoryWriter(str(tmp_path / "hands.bin")) as log:
+        engine = BlackjackEngine(history=log)
+        rebuilt = BlackjackEngine(seed=int(engine.shoe.seed))
+    assert (rebuilt.shoe.cards == engine.shoe.cards).all()
@@ -0,0 +1,25 @@
+import numpy as np
+from results import RunningStats
+
+
+def test_running_stats_match_numpy():
+    net = np.random.default_rng(1).choice([-10, 0, 10, 15], size=5000)
+    single, batched = RunningStats(), RunningStats()
+    for value in net:
+        single.update(int(value))
+    for block in np.array_split(net, [1, 7, 1000, 1001, 3500]):
+        batched.update_batch(block)
+    cumulative = np.cumsum(net)
+    drawdown = (np.maximum.accumulate(np.maximum(cumulative, 0)) - cumulative).max()
+    for stats in (single, batched):
+        assert stats.rounds == net.size
+        assert (stats.wins, stats.losses, stats.pushes) == ((net > 0).sum(), (net < 0).sum(), (net == 0).sum())
+        assert np.isclose(stats.mean, net.mean())
+        assert np.isclose(stats.variance, net.var(ddof=1))
+        assert stats.total == cumulative[-1]
+        assert stats.max_drawdown == drawdown
+
+def test_running_stats_empty_batch():
+    stats = RunningStats()
+    stats.update_batch([])
+    assert stats.rounds == 0 and stats.variance == 0.0
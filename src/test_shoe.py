@@ -0,0 +1,36 @@
+import numpy as np
+from hand import card_rank
+from shoe import Shoe, HILO_BY_CODE
+
+
+def test_needs_shuffle_after_cut_card():
+    shoe = Shoe(2, penetration=0.75, rng=np.random.default_rng(1))
+    assert shoe.cut_card == 78
+    for _ in range(shoe.cut_card):
+        shoe.draw()
+    assert not shoe.needs_shuffle
+    shoe.draw()
+    assert shoe.needs_shuffle
+    shoe.shuffle()
+    assert len(shoe) == shoe.size and shoe.running_count == 0 and not shoe.needs_shuffle
+
+def test_running_count_and_rank_counts_follow_the_cards():
+    shoe = Shoe(3, rng=np.random.default_rng(2))
+    dealt = [shoe.draw() for _ in range(100)]
+    assert shoe.running_count == sum(HILO_BY_CODE[code] for code in dealt)
+    ranks = np.bincount([card_rank(code) for code in dealt], minlength=13)
+    assert shoe.composition().tolist() == (12 - ranks).tolist()
+    assert shoe.true_count == shoe.running_count / ((shoe.size - 100) / 52)
+
+def test_full_shoe_counts_back_to_zero():
+    shoe = Shoe(1, rng=np.random.default_rng(3))
+    for _ in range(shoe.size):
+        shoe.draw()
+    assert shoe.running_count == 0 and sum(shoe.rank_counts) == 0
+    shoe.draw() # An empty shoe starts a fresh one
+    assert shoe.shuffles == 2 and len(shoe) == shoe.size - 1
+
+def test_seeded_shoes_repeat():
+    first, second = Shoe(3, rng=np.random.default_rng(7)), Shoe(3, rng=np.random.default_rng(7))
+    assert (first.cards == second.cards).all()
+    assert first.seed == 7 and first.stream == -1
@@ -0,0 +1,154 @@
+import numpy as np
+from constants import DEFAULT_NUM_DECKS, DEFAULT_BET, STRAT_DEALER_MIMIC
+from strategies import (
+    STAND, HIT, TABLE_SHAPE, get_strategy, register_strategy, validate_table, save_strategy_table
+)
+from hand import max_hand_cards
+from gym_env import BlackjackVectorEnv
+from batch_sim import simulate_batch
+
+# Learns a hit/stand table over (player total, soft flag, dealer upcard) from batches of hands
+# played side by side in BlackjackVectorEnv, i.e. on the same rules and shoes as the engine.
+DEFAULT_TRAIN_LANES = 4096
+
+
+def _state_index(obs):
+    """Flat index into the value arrays for a batch of observations."""
+    return np.ravel_multi_index((obs[:, 0], obs[:, 1], obs[:, 2]), TABLE_SHAPE)
+
+
+class StrategyTrainer:
+    """Batched Monte Carlo control ("mc") or tabular Q-learning ("q") for hit/stand tables.
+
+    Q holds the estimated value (in bets) of each action per state and is updated from a
+    whole batch of steps at once with sample-average step sizes. Actions are epsilon-greedy;
+    epsilon decays per batch. Hands that are decided by a Blackjack on the deal carry no
+    decision and are not learned from.
+    """
+    def __init__(self, method="mc", lanes=DEFAULT_TRAIN_LANES, num_decks=DEFAULT_NUM_DECKS,
+                 epsilon=1.0, epsilon_decay=0.97, min_epsilon=0.05, seed=None):
+        if method not in ("mc", "q"):
+            raise ValueError(f"Unknown training method '{method}', expected 'mc' or 'q'.")
+        self.method = method
+        self.epsilon = epsilon
+        self.epsilon_decay = epsilon_decay
+        self.min_epsilon = min_epsilon
+        self.rng = np.random.default_rng(seed)
+
+        states = int(np.prod(TABLE_SHAPE))
+        self.q = np.zeros((states, 2))
+        self.visits = np.zeros((states, 2), dtype=np.int64)
+        self.episodes = 0
+        self.history = [] # Convergence statistics per batch
+
+        self.env = BlackjackVectorEnv(lanes, num_decks=num_decks)
+        self.obs, _ = self.env.reset(seed=int(self.rng.integers(2**63)))
+        # Monte Carlo: the (state, action) pairs visited in each lane's current hand, -1 = unused.
+        # A hand decides at most once per card it holds without busting, so this never overflows.
+        max_decisions = max_hand_cards(num_decks)
+        self._visited_states = np.full((lanes, max_decisions), -1, dtype=np.int64)
+        self._visited_actions = np.zeros((lanes, max_decisions), dtype=np.int64)
+        self._decisions = np.zeros(lanes, dtype=np.int64)
+
+    def greedy_actions(self, states):
+        """Best known action per state; ties (e.g. unvisited states) hit below 17 and stand above."""
+        q = self.q[states]
+        tie = q[:, HIT] == q[:, STAND]
+        totals = np.unravel_index(states, TABLE_SHAPE)[0]
+        return np.where(tie, np.where(totals < 17, HIT, STAND), np.where(q[:, HIT] > q[:, STAND], HIT, STAND))
+
+    def _update(self, states, actions, targets):
+        """Moves Q towards the mean of the targets, weighting by how often each pair was seen."""
+        np.add.at(self.visits, (states, actions), 1)
+        error = np.zeros_like(self.q)
+        np.add.at(error, (states, actions), targets - self.q[states, actions])
+        seen = self.visits > 0
+        self.q[seen] += error[seen] / self.visits[seen]
+
+    def train_batch(self, steps=64):
+        """Plays `steps` decisions in every lane and updates Q. Returns this batch's statistics."""
+        env = self.env
+        lanes = env.num_envs
+        old_policy = self.policy_table()
+        old_q = self.q.copy()
+        returns, finished = 0.0, 0
+
+        for _ in range(steps):
+            states = _state_index(self.obs)
+            player_bj, dealer_bj = env.blackjacks()
+            decides = ~(player_bj | dealer_bj)
+            explore = self.rng.random(lanes) < self.epsilon
+            actions = np.where(explore, self.rng.integers(0, 2, lanes), self.greedy_actions(states))
+
+            next_obs, rewards, terminated, _, _ = env.step(actions)
+            returns += rewards[terminated].sum()
+            finished += int(terminated.sum())
+
+            if self.method == "q":
+                # Hands only continue after a hit below 21, so bootstrapping uses the next decision's best value
+                future = np.where(terminated, 0.0, self.q[_state_index(next_obs)].max(axis=1))
+                self._update(states[decides], actions[decides], (rewards + future)[decides])
+            else:
+                lane = np.flatnonzero(decides)
+                slot = self._decisions[lane]
+                self._visited_states[lane, slot] = states[lane]
+                self._visited_actions[lane, slot] = actions[lane]
+                self._decisions[lane] += 1
+
+                done = np.flatnonzero(terminated)
+                visited = self._visited_states[done]
+                used = visited >= 0
+                counts = used.sum(axis=1)
+                self._update(visited[used], self._visited_actions[done][used], np.repeat(rewards[done], counts))
+                self._visited_states[done] = -1
+                self._decisions[done] = 0
+            self.obs = next_obs
+
+        self.episodes += finished
+        self.epsilon = max(self.min_epsilon, self.epsilon * self.epsilon_decay)
+        stats = {
+            "episodes": self.episodes,
+            "mean_return": float(returns / max(finished, 1)),
+            "policy_changes": int((self.policy_table() != old_policy).sum()),
+            "max_q_change": float(np.abs(self.q - old_q).max()),
+            "states_visited": int((self.visits.sum(axis=1) > 0).sum()),
+            "epsilon": self.epsilon,
+        }
+        self.history.append(stats)
+        return stats
+
+    def train(self, batches=200, steps=64, patience=10, verbose=True):
+        """Trains until `batches` batches have run or the greedy policy has not changed for `patience` batches."""
+        stable = 0
+        for batch in range(batches):
+            stats = self.train_batch(steps)
+            stable = stable + 1 if stats["policy_changes"] == 0 else 0
+            if verbose and (batch % 10 == 0 or stable >= patience):
+                print(f"Batch {batch}: {stats['episodes']} hands, mean return {stats['mean_return']:+.4f}, "
+                      f"{stats['policy_changes']} policy changes, max dQ {stats['max_q_change']:.4f}")
+            if stable >= patience and self.epsilon <= self.min_epsilon:
+                break
+        return self.history
+
+    def policy_table(self, fallback=STRAT_DEALER_MIMIC):
+        """The greedy policy as a strategy table; states never visited keep the fallback strategy's action."""
+        states = np.arange(self.q.shape[0])
+        table = self.greedy_actions(states).reshape(TABLE_SHAPE).astype(np.uint8)
+        unvisited = (self.visits.sum(axis=1) == 0).reshape(TABLE_SHAPE)
+        table[unvisited] = get_strategy(fallback)[unvisited]
+        return validate_table(table)
+
+    def export(self, name, path=None):
+        """Registers the learned policy under name so engines and player_ai_action can play it.
+
+        With a path the table is also saved as a CSV or JSON chart (see strategies.save_strategy_table).
+        """
+        table = register_strategy(name, self.policy_table())
+        if path is not None:
+            save_strategy_table(name, path)
+        return table
+
+    def evaluate(self, num_hands=1_000_000, rng=None):
+        """Expected result per hand (in bets) of the greedy policy, played without exploration."""
+        net = simulate_batch(self.policy_table(), num_hands, rng=np.random.default_rng(rng))
+        return float(net.mean()) / DEFAULT_BET
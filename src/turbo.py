@@ -0,0 +1,119 @@
+import time
+import numpy as np
+from constants import TURBO_FRAME_BUDGET_MS, TURBO_CURVE_POINTS
+from results import RunningStats
+from log import get_logger
+
+logger = get_logger(__name__)
+
+# Turbo / spectator mode: the GUI keeps its window but plays whole rounds through the game
+# logic as fast as it can, without sprites, pacing or per-round logging, and only shows a
+# live panel (see renderer.TurboOverlay) with the running numbers.
+
+
+class BalanceCurve:
+    """The balance after every round, thinned out to at most max_points points.
+
+    When the buffer is full every other point is dropped and from then on only every
+    second round is kept (and so on), so the whole run always fits and stays evenly spaced.
+    """
+    def __init__(self, max_points=TURBO_CURVE_POINTS):
+        self.points = np.zeros(max_points)
+        self.count = 0
+        self.stride = 1 # Rounds per stored point
+        self._skipped = 0
+
+    def add(self, balance):
+        self._skipped += 1
+        if self._skipped < self.stride: return
+        self._skipped = 0
+        if self.count == self.points.size:
+            half = self.points[1::2]
+            self.count = half.size
+            self.points[:self.count] = half
+            self.stride *= 2
+        self.points[self.count] = balance
+        self.count += 1
+
+    def values(self):
+        return self.points[:self.count]
+
+    def clear(self):
+        self.count = 0
+        self.stride = 1
+        self._skipped = 0
+
+
+class TurboRunner:
+    """Plays AI rounds on a BlackjackEnv or table_env.BlackjackTableEnv within a time budget per frame.
+
+    While running, the game's card sprites and round logs are switched off (game.headless).
+    stats aggregates the net result per round (the table's total for a multi-seat table).
+    """
+    def __init__(self, game, curve_points=TURBO_CURVE_POINTS):
+        self.game = game
+        self.running = False
+        self.stats = RunningStats()
+        self.wagered = 0
+        self.curve = BalanceCurve(curve_points)
+        self.started_at = None
+        self._rate_mark = (0.0, 0)
+        self.rate = 0.0 # Rounds per second, measured over about half a second
+
+    def start(self):
+        """Starts turbo mode with fresh statistics, from an empty table."""
+        self.running = True
+        self.stats = RunningStats()
+        self.wagered = 0
+        self.curve.clear()
+        self.curve.add(self.game.balance)
+        self.started_at = time.perf_counter()
+        self._rate_mark = (self.started_at, 0)
+        self.rate = 0.0
+        self.game.headless = True
+        self.game.reset_round()
+        logger.info("Turbo mode on")
+
+    def stop(self):
+        """Back to normal play; the next round starts from the betting state."""
+        self.running = False
+        self.game.headless = False
+        self.game.reset_round()
+        logger.info("Turbo mode off after %d rounds, net €%d", self.stats.rounds, self.stats.total)
+
+    def _play_round(self):
+        """Plays one round. Returns False when nobody can place a bet any more."""
+        game = self.game
+        if hasattr(game, "seats"):
+            payouts = game.play_round()
+            if payouts is None: return False
+            net = sum(payout for payout in payouts if payout is not None)
+            self.wagered += sum(seat.last_bet for seat, payout in zip(game.seats, payouts) if payout is not None)
+        else:
+            bet = game.choose_bet()
+            net = game.play_round(bet)
+            if net is None: return False
+            self.wagered += bet
+        self.stats.update(net)
+        self.curve.add(game.balance)
+        return True
+
+    def run(self, budget_ms=TURBO_FRAME_BUDGET_MS):
+        """Plays rounds for about budget_ms. Returns False once nobody can place a bet any more."""
+        now = start = time.perf_counter()
+        deadline = start + budget_ms / 1000
+        while now < deadline:
+            if not self._play_round():
+                return False
+            now = time.perf_counter()
+
+        mark_time, mark_rounds = self._rate_mark
+        if now - mark_time >= 0.5:
+            self.rate = (self.stats.rounds - mark_rounds) / (now - mark_time)
+            self._rate_mark = (now, self.stats.rounds)
+        return True
+
+    @property
+    def ev(self):
+        """Net result per unit wagered so far (e.g. -0.005 is a 0.5% house edge)."""
+        return self.stats.total / self.wagered if self.wagered else 0.0